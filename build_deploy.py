@@ -15,6 +15,10 @@ def int_test():
     log.info('Running integration tests ...')
     __execute('python -m pytest tests/integration/')
 
+def bench_test():
+    log.info('Running benchmark tests ...')
+    __execute('BENCHMARK=1 python -m pytest tests/benchmark/')
+
 def install():
     log.info('Installing package locally ...')
     __execute('pip install .')
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """
+    A response stored by ``ResponseCache``.
+    """
+
+    def __init__(self, url: str, body: bytes, etag: str = None, last_modified: str = None,
+                 content_type: str = 'application/json'):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+
+    def validators(self) -> dict:
+        """
+        Returns the headers that turn a request for the URL of this entry into a conditional request.
+
+        Returns:
+            The ``If-None-Match`` and ``If-Modified-Since`` headers for which a validator is known.
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class ResponseCache:
+    """
+    This class is a persistent cache of API responses keyed by URL. Each response is stored in the given directory
+    together with its ``ETag`` and ``Last-Modified`` validators so that it can be requested conditionally and served
+    from disk when the API answers with HTTP 304. When the cache exceeds its size limits, the least recently used
+    responses are evicted. The methods are thread-safe so that the files can be read and written outside of the event
+    loop.
+    """
+
+    def __init__(self, path: str, max_size: int = 256 * 1024 * 1024, max_entries: int = 10000):
+        """
+        Create a new instance of this class. Responses cached by a previous instance in the same directory are reused.
+
+        Args:
+            path: The directory in which responses are stored. It is created if it does not exist.
+            max_size: The maximum total size of all stored response bodies in bytes.
+            max_entries: The maximum number of stored responses.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.__index = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        self.__load_index()
+
+    def __len__(self):
+        return len(self.__index)
+
+    @property
+    def size(self) -> int:
+        """
+        The total size of all stored response bodies in bytes.
+        """
+        return self.__size
+
+    def get(self, url: str) -> CacheEntry:
+        """
+        Returns the stored response for the given URL and marks it as recently used.
+
+        Args:
+            url: The URL of the response.
+
+        Returns:
+            The stored response or ``None`` if there is none.
+        """
+        key = _key(url)
+        with self.__lock:
+            meta = self.__index.get(key)
+            if meta is None:
+                return None
+
+            try:
+                with open(self.__body_path(key), 'rb') as file:
+                    body = file.read()
+            except FileNotFoundError:
+                self.__remove(key)
+                return None
+
+            self.__index.move_to_end(key)
+            os.utime(self.__body_path(key))
+
+        return CacheEntry(meta['url'], body, meta.get('etag'), meta.get('last_modified'), meta.get('content_type'))
+
+    def put(self, entry: CacheEntry) -> None:
+        """
+        Stores the given response, replacing any previous one for the same URL, and evicts the least recently used
+        responses if the size limits are exceeded.
+
+        Args:
+            entry: The response to store.
+        """
+        key = _key(entry.url)
+        with self.__lock:
+            if key in self.__index:
+                self.__remove(key)
+
+            if len(entry.body) > self.max_size:
+                return
+
+            meta = {'url': entry.url, 'etag': entry.etag, 'last_modified': entry.last_modified,
+                    'content_type': entry.content_type, 'size': len(entry.body)}
+            _write_atomic(self.__body_path(key), entry.body)
+            _write_atomic(self.__meta_path(key), json.dumps(meta).encode('utf-8'))
+
+            self.__index[key] = meta
+            self.__size += meta['size']
+
+            while self.__size > self.max_size or len(self.__index) > self.max_entries:
+                self.__remove(next(iter(self.__index)))
+
+    def clear(self) -> None:
+        """
+        Removes all stored responses.
+        """
+        with self.__lock:
+            for key in list(self.__index):
+                self.__remove(key)
+
+    def __load_index(self) -> None:
+        """
+        Loads the metadata of the stored responses ordered from the least to the most recently used one.
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            if not name.endswith('.json'):
+                continue
+
+            key = name[:-len('.json')]
+            try:
+                with open(self.__meta_path(key), 'rb') as file:
+                    meta = json.loads(file.read().decode('utf-8'))
+                used_at = os.path.getmtime(self.__body_path(key))
+            except (OSError, ValueError):
+                continue
+
+            entries.append((used_at, key, meta))
+
+        for _, key, meta in sorted(entries, key=lambda entry: entry[0]):
+            self.__index[key] = meta
+            self.__size += meta['size']
+
+    def __remove(self, key: str) -> None:
+        meta = self.__index.pop(key, None)
+        if meta is not None:
+            self.__size -= meta['size']
+
+        for path in (self.__body_path(key), self.__meta_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def __body_path(self, key: str) -> str:
+        return os.path.join(self.path, key + '.body')
+
+    def __meta_path(self, key: str) -> str:
+        return os.path.join(self.path, key + '.json')
+
+
+def _key(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
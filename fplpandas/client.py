@@ -0,0 +1,1312 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Iterator, AsyncIterator, Callable, TYPE_CHECKING
+import asyncio
+import itertools
+import time
+from contextlib import contextmanager
+import threading
+import weakref
+from concurrent.futures import Executor
+
+from .live import LiveState
+from .metrics import Instrumentation
+from .schema import SCHEMAS, apply_schema
+from .snapshot import save_snapshot
+
+if TYPE_CHECKING:
+    from fpl import FPL
+    from .cache import ResponseCache
+    from .http import RateLimiter
+    from .replay import ResponseRecorder
+    from .warehouse import HistoryWarehouse
+
+# The bootstrap-static fields of a player that are compared to detect changes in incremental mode.
+INCREMENTAL_FIELDS = ['total_points', 'minutes', 'event_points', 'bonus', 'bps']
+
+
+# The names of the data frames returned by get_players(), which are also used for snapshots and schemas.
+PLAYERS_FRAMES = ['players', 'players_history_past', 'players_history', 'players_fixtures']
+
+# The number of players or users whose results are converted to data frames by one task of the conversion pool.
+CONVERSION_SHARD_SIZE = 100
+
+
+# noinspection PyTypeChecker
+class FPLPandas:
+    """
+    This class is a wrapper for the FPL library: https://github.com/amosbastian/fpl It converts the JSON output to pandas data frames.
+    It also provides a synchronous layer over the asynchronous library in order to reduce the requirements for Jupyter kernel. Otherwise iPython >= 7.0
+    (see https://stackoverflow.com/questions/47518874/how-do-i-run-python-asyncio-code-in-a-jupyter-notebook)
+    and ipykernel >= 5.0.1  (see https://github.com/ipython/ipykernel/issues/356) are required.
+    Callers that already run an event loop should use ``AsyncFPLPandas`` instead.
+    """
+
+    def __init__(self, email: str = None, password: str = None, fpl: FPL = None, pool_size: int = 100,
+                 keep_alive: float = 15.0, login_ttl: float = 3600.0, snapshot_ttl: float = 300.0,
+                 rate_limiter: RateLimiter = None, http_cache: ResponseCache = None, compact: bool = False,
+                 recorder: ResponseRecorder = None, base_url: str = None, instrumentation: Instrumentation = None,
+                 json_loads: Callable = None, warehouse: HistoryWarehouse = None, conversion_pool: Executor = None):
+        """
+        Create a new instance of this class and starts a thread that runs the event loop for async execution. The
+        instance can be used from multiple threads at the same time. Call ``close()`` or use it as a context manager to
+        release the HTTP session and the thread.
+
+        Args:
+            email: The email address used to log in to the FPL web site. Only required for protected info such as user team.
+            password: The password used to log in to the FPL web site. Only required for protected info such as user team.
+            fpl: The FPL instance to use. This particular useful for injecting a mock instance for automated testing.
+            If not set, an FPL instance will be created.
+            pool_size: The maximum number of simultaneous connections held by the HTTP session of this instance.
+            keep_alive: The number of seconds an idle connection is kept open for reuse.
+            login_ttl: The number of seconds after which a successful login is considered expired and is repeated.
+            snapshot_ttl: The number of seconds for which the bootstrap-static data shared by teams, game weeks and players
+            is reused before it is downloaded again.
+            rate_limiter: The rate limiter shared by all requests of this instance. If not set, a ``RateLimiter`` with
+            default settings is used.
+            http_cache: The persistent cache for API responses. The private data of the logged-in user, e.g. from
+            ``get_user_team()``, is never cached. If not set, responses are not cached.
+            compact: If ``True``, the columns of the returned data frames are converted to compact data types according to
+            ``schema.SCHEMAS``: categoricals for repeated strings, nullable integer types of a fixed width per column,
+            parsed date times and floats for numbers encoded as strings such as ``form``.
+            recorder: The recorder that captures the API responses to a directory, from which they can be served by
+            ``replay.ReplayServer``. If not set, responses are not recorded.
+            base_url: The URL of a stand-in server for the FPL API, e.g. ``replay.ReplayServer.base_url``. If not set,
+            requests are sent to the FPL API.
+            instrumentation: The instrumentation to which the requests, waits, logins, JSON decoding and conversions to
+            data frames are reported, e.g. a ``metrics.MetricsCollector``. If not set, they are not reported.
+            json_loads: The function that decodes the JSON bodies of all responses, e.g. ``orjson.loads``. It is passed
+            the body as bytes. If not set, ``json.loads`` is used.
+            warehouse: The store to which the completed games are appended whenever the players are downloaded with
+            ``get_players()`` or ``iter_players()``, so that the history of past seasons is kept. If not set, the
+            history is not stored.
+            conversion_pool: The process pool, e.g. a ``concurrent.futures.ProcessPoolExecutor``, across which the
+            conversion of large results of ``get_players()`` and the bulk user getters to data frames is sharded, so that
+            it uses more than one core. The pool is not shut down by this instance. If not set, the results are converted
+            on the thread of the event loop.
+        """
+        self.__api = AsyncFPLPandas(email, password, fpl, pool_size=pool_size, keep_alive=keep_alive,
+                                    login_ttl=login_ttl, snapshot_ttl=snapshot_ttl, rate_limiter=rate_limiter,
+                                    http_cache=http_cache, compact=compact, recorder=recorder, base_url=base_url,
+                                    instrumentation=instrumentation, json_loads=json_loads,
+                                    warehouse=warehouse, conversion_pool=conversion_pool)
+        self.__aio_loop = asyncio.new_event_loop()
+        self.__aio_thread = threading.Thread(target=_run_event_loop, args=(self.__aio_loop, self.__api),
+                                             name='fplpandas-event-loop', daemon=True)
+        self.__aio_thread.start()
+        # Stops the event loop if the instance is garbage collected without being closed.
+        self.__finalizer = weakref.finalize(self, self.__aio_loop.call_soon_threadsafe, self.__aio_loop.stop)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """ Closes the HTTP session and stops the event loop of this instance. The instance cannot be used afterwards.
+        Calling this method more than once has no effect.
+        """
+        if not self.__finalizer.alive:
+            return
+
+        self.__finalizer()
+        if threading.current_thread() is not self.__aio_thread:
+            self.__aio_thread.join()
+
+    def __run(self, coro):
+        """ Runs the given coroutine on the event loop of this instance and waits for its result. This method can be
+        called from multiple threads at the same time, in which case the coroutines run concurrently.
+
+        Args:
+            coro: The coroutine to execute.
+
+        Returns:
+            The result of the passed coroutine.
+        Raises:
+            RuntimeError: The instance has been closed.
+        """
+        if not self.__finalizer.alive:
+            coro.close()
+            raise RuntimeError('This FPLPandas instance has been closed.')
+
+        return asyncio.run_coroutine_threadsafe(coro, self.__aio_loop).result()
+
+    def set_cred(self, email: str, password: str) -> None:
+        """ Sets the credentials to use when accessing user specific data. This method does not trigger a login call
+        but any previous login is discarded.
+        Args:
+            email: The email address used to log in to the FPL web site. Only required for protected info such as user team.
+            password: The password used to log in to the FPL web site. Only required for protected info such as user team.
+        """
+        # The credentials are changed on the event loop, so that they do not change in the middle of a login.
+        async def set_cred():
+            self.__api.set_cred(email, password)
+
+        self.__run(set_cred())
+
+    def refresh(self) -> None:
+        """ Downloads the bootstrap-static data shared by teams, game weeks and players again, regardless of its age.
+        """
+        self.__run(self.__api.refresh())
+
+    def get_teams(self, team_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """Returns either a list of *all* teams, or a list of teams with IDs in
+        the optional ``team_ids`` list.
+
+        Information is taken from:
+            https://fantasy.premierleague.com/api/bootstrap-static/
+
+        Args:
+            team_ids: (optional) List containing the IDs of teams. If not set a list of *all* teams will be returned.
+            columns: (optional) The columns to return besides the index. The other fields are skipped when the records
+            are flattened. Columns not returned by the API are filled with missing values.
+        Returns:
+            The teams as a pandas data frame.
+        """
+        return self.__run(self.__api.get_teams(team_ids, columns))
+
+    def get_game_weeks(self, game_week_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """Returns either a list of *all* game weeks, or a list of game weeks with IDs in
+        the optional ``game_week_ids`` list.
+
+        Information is taken from:
+            https://fantasy.premierleague.com/api/bootstrap-static/
+
+        Args:
+            game_week_ids: (optional) List containing the IDs of game weeks. If not set a list of *all* game weeks will be returned.
+            columns: (optional) The columns to return besides the index. The other fields are skipped when the records
+            are flattened. Columns not returned by the API are filled with missing values.
+        Returns:
+            The game weeks as a pandas data frame.
+        """
+        return self.__run(self.__api.get_game_weeks(game_week_ids, columns))
+
+    def get_player(self, player_id: int, columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """Returns the player with the given ``player_id`` as a data frame and his associated data.
+
+        Information is taken from:
+            https://fantasy.premierleague.com/api/bootstrap-static/
+            https://fantasy.premierleague.com/api/element-summary/1/ (optional)
+
+        Args:
+            player_id: A player's ID.
+            columns: (optional) The columns to return besides the index keyed by the name of the data frame in
+            ``PLAYERS_FRAMES``, e.g. ``{'players': ['web_name'], 'players_history': ['total_points']}``. The other fields
+            are skipped when the records are flattened. Data frames without an entry contain all columns.
+        Returns:
+            1: The player data as a pandas data frame with one row indexed by ``player_id``.
+            2: The summary stats for the past seasons s a pandas data frame indexed by ``player_id``, ``season_name``.
+            3: The stats for the completed games as a pandas data frame indexed by ``player_id``, ``fixture``. At the beginning of the season this data frame is empty.
+            4: The data for the upcoming fixtures as a pandas data frame indexed by ``player_id``, ``event``. At the end of the season this data frame is empty.
+        Raises:
+            ValueError: Player with ``player_id`` not found
+        """
+        return self.__run(self.__api.get_player(player_id, columns))
+
+    def get_players(self, player_ids: List[int] = None, incremental: bool = False,
+                    columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """Returns either a list of *all' players, or a list of players whose
+        IDs are in the given ``player_ids`` list as a data frame indexed by  indexed by ``player_id`` and their associated data.
+
+        Information is taken from:
+            https://fantasy.premierleague.com/api/bootstrap-static/
+            https://fantasy.premierleague.com/api/element-summary/{player_id}/
+
+        Args:
+            player_ids: (optional) A list of player IDs
+            incremental: (optional) If ``True``, the summaries are only downloaded for the players that have changed since
+            the previous incremental call with the same ``player_ids``. A player has changed if one of the bootstrap-static
+            fields in ``INCREMENTAL_FIELDS`` differs, if the kick-off time of his next fixture has passed or if an
+            upcoming fixture of his team has been rescheduled or re-rated. The rows of all other players are taken from
+            the previous result.
+            columns: (optional) The columns to return besides the index keyed by the name of the data frame in
+            ``PLAYERS_FRAMES``, e.g. ``{'players': ['web_name'], 'players_history': ['total_points']}``. The other fields
+            are skipped when the records are flattened. Data frames without an entry contain all columns.
+        Returns:
+            1: The team players as a pandas data frame indexed by ``player_id``.
+            2: The summary stats for the past seasons s a pandas data frame indexed by ``player_id``, ``season_name``.
+            3: The stats for the completed games as a pandas data frame indexed by ``player_id``, ``fixture``. At the beginning of the season this data frame is empty.
+            4: The data for the upcoming fixtures as a pandas data frame indexed by ``player_id``, ``event``. At the end of the season this data frame is empty.
+        """
+        return self.__run(self.__api.get_players(player_ids, incremental, columns))
+
+    def iter_players(self, player_ids: List[int] = None, batch_size: int = 50,
+                     columns: Dict[str, List[str]] = None) -> Iterator[List[pd.DataFrame]]:
+        """Iterates over either *all* players, or the players whose IDs are in the given ``player_ids`` list in batches.
+        Each batch is returned as soon as the summaries of ``batch_size`` players have been downloaded, so that it can be
+        processed before the summaries of the other players are available.
+
+        Information is taken from:
+            https://fantasy.premierleague.com/api/bootstrap-static/
+            https://fantasy.premierleague.com/api/element-summary/{player_id}/
+
+        Args:
+            player_ids: (optional) A list of player IDs
+            batch_size: (optional) The number of players per batch. The last batch may be smaller.
+            columns: (optional) The columns to return besides the index keyed by the name of the data frame like for
+            ``get_players()``.
+        Returns:
+            An iterator of batches with the same data frames as returned by ``get_players()`` for the players of the batch.
+            The batches are in the order in which the summaries were downloaded.
+        """
+        batches = self.__api.iter_players(player_ids, batch_size, columns)
+        try:
+            while True:
+                try:
+                    yield self.__run(batches.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.__run(batches.aclose())
+
+    def get_fixtures(self, columns: List[str] = None, events: List[int] = None) -> pd.DataFrame:
+        """Returns a list of *all* fixtures, or the fixtures of the game weeks in the optional ``events`` list as data
+        frame.
+
+        Information is taken from e.g.:
+            https://fantasy.premierleague.com/api/fixtures/
+            https://fantasy.premierleague.com/api/fixtures/?event=1
+
+        Args:
+            columns: (optional) The columns to return besides the index. The other fields are skipped when the records
+            are flattened. Columns not returned by the API are filled with missing values.
+
+            events: (optional) The IDs of the game weeks whose fixtures are returned. The game weeks are downloaded
+            concurrently. Game weeks whose fixtures have all finished are cached for the lifetime of this instance, as
+            their fixtures do not change anymore. If not set, the fixtures of the whole season are downloaded.
+        Returns:
+            The fixtures as a pandas data frame.
+        """
+        return self.__run(self.__api.get_fixtures(columns, events))
+
+    def poll_live(self, event: int = None, interval: float = 60.0, state: LiveState = None,
+                  max_polls: int = None) -> Iterator[pd.DataFrame]:
+        """Polls the live stats of the players in a game week and returns the players whose stats have changed since the
+        previous poll. The first poll returns all players. Polls without changes are not returned.
+
+        Information is taken from e.g.:
+            https://fantasy.premierleague.com/api/event/1/live
+
+        Args:
+            event: (optional) The ID of the game week. If not set, the current game week is polled.
+            interval: (optional) The number of seconds between two polls.
+            state: (optional) The state that holds the current stats of all players and defines which stats are tracked.
+            Its data frame ``state.df`` is kept up to date in place. If not set, a ``LiveState`` tracking ``LIVE_FIELDS``
+            is used.
+            max_polls: (optional) The number of polls after which the iteration stops. If not set, it never stops.
+        Returns:
+            An iterator of the changed players with their new stats as pandas data frames indexed by ``player_id``.
+        """
+        deltas = self.__api.poll_live(event, interval, state, max_polls)
+        try:
+            while True:
+                try:
+                    yield self.__run(deltas.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.__run(deltas.aclose())
+
+    def get_user_team(self, user_id: int = None, columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ Returns information about the players in the current team, the chips and transfer info of the user with
+        the given user ID. This method requires that a valid email and password are set using the constructor.
+
+        Args:
+            user_id: The user ID for which to get the team information. If not provided, it defaults to the user ID of the currently authenticated user.
+            columns: (optional) The columns to return besides the index keyed by ``picks``, ``chips`` or ``transfers``,
+            e.g. ``{'picks': ['position', 'multiplier']}``. Data frames without an entry contain all columns.
+
+        Returns:
+            The team, chips, transfer info as a pandas data frame.
+        """
+        return self.__run(self.__api.get_user_team(user_id, columns))
+
+    def get_user_info(self, columns: List[str] = None) -> pd.DataFrame:
+        """ Returns information about the currently authenticated user. This method requires that a valid email and password are set using the constructor.
+
+        Args:
+            columns: (optional) The columns to return. Columns not returned by the API are filled with missing values.
+
+        Returns:
+            The user info in a pandas data frame.
+        """
+        return self.__run(self.__api.get_user_info(columns))
+
+    def get_user_teams(self, user_ids: List[int], max_concurrency: int = 10,
+                       columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ Returns the players in the current team, the chips and the transfer info of each of the given users. The
+        teams are downloaded concurrently over the authenticated session of this instance. This method requires that a
+        valid email and password are set using the constructor.
+
+        Information is taken from e.g.:
+            https://fantasy.premierleague.com/api/my-team/91928/
+
+        Args:
+            user_ids: The IDs of the users.
+            max_concurrency: (optional) The maximum number of users whose team is downloaded at the same time.
+            columns: (optional) The columns to return besides the index keyed by ``picks``, ``chips`` or ``transfers``,
+            e.g. ``{'picks': ['multiplier']}``. The other fields are skipped when the records are flattened. Data frames
+            without an entry contain all columns.
+
+        Returns:
+            1: The picks of all users as a pandas data frame indexed by ``user_id``, ``player_id``.
+            2: The chips of all users as a pandas data frame indexed by ``user_id``.
+            3: The transfer info of all users as a pandas data frame indexed by ``user_id``.
+            4: The errors of the users whose team could not be downloaded as a pandas data frame indexed by ``user_id``.
+        Raises:
+            ValueError: The email or the password is not set
+        """
+        return self.__run(self.__api.get_user_teams(user_ids, max_concurrency, columns))
+
+    def get_user_picks(self, user_ids: List[int], event: int, max_concurrency: int = 10,
+                       columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ Returns the picks of each of the given users for the given game week. The picks are downloaded concurrently.
+
+        Information is taken from e.g.:
+            https://fantasy.premierleague.com/api/entry/91928/event/1/picks/
+
+        Args:
+            user_ids: The IDs of the users.
+            event: The ID of the game week.
+            max_concurrency: (optional) The maximum number of users whose picks are downloaded at the same time.
+            columns: (optional) The columns to return besides the index keyed by ``picks`` or ``entry_history``, e.g.
+            ``{'entry_history': ['points', 'bank']}``. The other fields are skipped when the records are flattened. Data
+            frames without an entry contain all columns.
+
+        Returns:
+            1: The picks of all users as a pandas data frame indexed by ``user_id``, ``player_id``.
+            2: The game week history of all users as a pandas data frame indexed by ``user_id``.
+            3: The errors of the users whose picks could not be downloaded as a pandas data frame indexed by ``user_id``.
+        """
+        return self.__run(self.__api.get_user_picks(user_ids, event, max_concurrency, columns))
+
+    def get_user_histories(self, user_ids: List[int], max_concurrency: int = 10,
+                           columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ Returns the history of each of the given users. The histories are downloaded concurrently.
+
+        Information is taken from e.g.:
+            https://fantasy.premierleague.com/api/entry/91928/history/
+
+        Args:
+            user_ids: The IDs of the users.
+            max_concurrency: (optional) The maximum number of users whose history is downloaded at the same time.
+            columns: (optional) The columns to return besides the index keyed by ``current``, ``past`` or ``chips``, e.g.
+            ``{'current': ['points', 'overall_rank']}``. The other fields are skipped when the records are flattened.
+            Data frames without an entry contain all columns.
+
+        Returns:
+            1: The game weeks of the current season of all users as a pandas data frame indexed by ``user_id``, ``event``.
+            2: The past seasons of all users as a pandas data frame indexed by ``user_id``, ``season_name``.
+            3: The chips played by all users as a pandas data frame indexed by ``user_id``.
+            4: The errors of the users whose history could not be downloaded as a pandas data frame indexed by ``user_id``.
+        """
+        return self.__run(self.__api.get_user_histories(user_ids, max_concurrency, columns))
+
+    def save_snapshot(self, path: str, file_format: str = 'arrow') -> str:
+        """ Downloads teams, game weeks, fixtures and all players and saves the data frames as a new version of the
+        snapshot in the given directory. The data frames can be loaded again without network access using
+        ``load_snapshot()``. This method requires the pyarrow package.
+
+        The snapshot contains the data frames ``teams``, ``game_weeks``, ``fixtures``, ``players``,
+        ``players_history_past``, ``players_history`` and ``players_fixtures`` with the same indexes as returned by the
+        getters.
+
+        Args:
+            path: The directory of the snapshot.
+            file_format: ``arrow`` for uncompressed Arrow IPC files that can be memory-mapped or ``parquet`` for smaller
+            Parquet files.
+
+        Returns:
+            The version of the saved snapshot.
+        """
+        return self.__run(self.__api.save_snapshot(path, file_format))
+
+
+# noinspection PyTypeChecker
+class AsyncFPLPandas:
+    """
+    This class is the asynchronous counterpart of ``FPLPandas`` for callers that already run an event loop, e.g. a web
+    service. All getters are coroutines that return the same data frames as the ones of ``FPLPandas``. An instance must
+    only be used from the event loop on which it was first used.
+    """
+
+    def __init__(self, email: str = None, password: str = None, fpl: FPL = None, pool_size: int = 100,
+                 keep_alive: float = 15.0, login_ttl: float = 3600.0, snapshot_ttl: float = 300.0,
+                 rate_limiter: RateLimiter = None, http_cache: ResponseCache = None, compact: bool = False,
+                 recorder: ResponseRecorder = None, base_url: str = None, instrumentation: Instrumentation = None,
+                 json_loads: Callable = None, warehouse: HistoryWarehouse = None, conversion_pool: Executor = None):
+        """
+        Create a new instance of this class. See ``FPLPandas.__init__()`` for the arguments.
+        """
+        self.set_cred(email, password)
+        self.__fpl = fpl
+        self.__session = None
+        self.__pool_size = pool_size
+        self.__keep_alive = keep_alive
+        self.__login_ttl = login_ttl
+        self.__snapshot_ttl = snapshot_ttl
+        self.__snapshot_at = None if fpl is None else time.monotonic()
+        self.__snapshot_lock = None
+        self.__login_lock = None
+        self.__rate_limiter = rate_limiter
+        self.__http_cache = http_cache
+        self.__compact = compact
+        self.__recorder = recorder
+        self.__base_url = base_url
+        self.__instrumentation = Instrumentation() if instrumentation is None else instrumentation
+        self.__json_loads = json_loads
+        self.__warehouse = warehouse
+        self.__conversion_pool = conversion_pool
+        self.__finished_fixtures = {}
+        self.__players_state = None
+        self.__in_flight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """ Closes the HTTP session of this instance if it has created one. Calling this method more than once has no effect.
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __get_fpl(self) -> FPL:
+        """ Gets the FPL instance of this object. If none has been injected or created yet, it creates one backed by
+        a connection pooling HTTP session that is kept for the lifetime of this object. The bootstrap-static snapshot
+        held by the FPL instance is downloaded again if it is older than the snapshot TTL.
+
+        Returns:
+            The FPL instance.
+        """
+        # The HTTP client, the FPL package and the extensions of FPL are only imported when they are first needed.
+        from .extensions import _create_fpl
+
+        if self.__fpl is None:
+            import aiohttp
+            from .http import RateLimiter, Session
+
+            rate_limiter = RateLimiter() if self.__rate_limiter is None else self.__rate_limiter
+            connector = aiohttp.TCPConnector(limit=self.__pool_size, keepalive_timeout=self.__keep_alive)
+            self.__session = aiohttp.ClientSession(connector=connector)
+            self.__fpl = _create_fpl(Session(self.__session, rate_limiter, cache=self.__http_cache,
+                                             recorder=self.__recorder, base_url=self.__base_url,
+                                             instrumentation=self.__instrumentation, json_loads=self.__json_loads))
+
+        if self.__snapshot_lock is None:
+            self.__snapshot_lock = asyncio.Lock()
+
+        # Concurrent calls wait for the same download instead of each downloading bootstrap-static.
+        async with self.__snapshot_lock:
+            if self.__snapshot_at is None or time.monotonic() - self.__snapshot_at >= self.__snapshot_ttl:
+                await self.__fpl.refresh()
+                self.__snapshot_at = time.monotonic()
+
+        return self.__fpl
+
+    async def __login(self, fpl: FPL) -> None:
+        """ Logs in with the credentials of this object unless a previous login is still valid.
+
+        Args:
+            fpl: The FPL instance to log in with.
+        """
+        if self.__login_lock is None:
+            self.__login_lock = asyncio.Lock()
+
+        async with self.__login_lock:
+            if self.__logged_in_at is not None and time.monotonic() - self.__logged_in_at < self.__login_ttl:
+                return
+
+            start = time.perf_counter()
+            email, password = self.__email, self.__password
+            await fpl.login(email, password)
+            self.__instrumentation.on_login(time.perf_counter() - start)
+            # A login with credentials that were replaced by set_cred() in the meantime is not kept.
+            if (email, password) == (self.__email, self.__password):
+                self.__logged_in_at = time.monotonic()
+
+    async def __call_api(self, func, requires_login: bool = False) -> dict:
+        """ Calls the given FPL API function asynchronously.
+
+        Args:
+            func: The API function to execute.
+            requires_login: Whether the call requires authentication.
+
+        Returns:
+            The result of the passed function.
+        """
+        return await func(await self.__prepare_fpl(requires_login))
+
+    async def __prepare_fpl(self, requires_login: bool = False) -> FPL:
+        """ Gets the FPL instance of this object and logs in with it if required.
+
+        Args:
+            requires_login: Whether the caller requires authentication.
+
+        Returns:
+            The FPL instance.
+        Raises:
+            ValueError: The email or the password is not set
+        """
+        if requires_login and self.__email is None:
+            raise ValueError("Email not provided. For functions that require login, the email address is mandatory. Please set the email address in the constructor. ")
+
+        if requires_login and self.__password is None:
+            raise ValueError("Password not provided. For functions that require login, the password is mandatory. Please set the password in the constructor.")
+
+        fpl = await self.__get_fpl()
+
+        if requires_login:
+            await self.__login(fpl)
+
+        return fpl
+
+    def __format(self, df: pd.DataFrame, name: str) -> pd.DataFrame:
+        """ Converts the given data frame to compact data types if the compact mode is enabled.
+
+        Args:
+            df: The data frame to convert.
+            name: The name of the schema of the data frame in ``SCHEMAS``.
+
+        Returns:
+            The converted data frame.
+        """
+        return apply_schema(df, SCHEMAS[name]) if self.__compact else df
+
+    def __format_players(self, players_frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        return [self.__format(df, name) for df, name in zip(players_frames, PLAYERS_FRAMES)]
+
+    async def __store_history(self, players_frames: List[pd.DataFrame]) -> None:
+        """
+        Appends the completed games of the given players to the warehouse of this instance, if it has one. Histories
+        whose columns were projected without ``round`` or ``kickoff_time`` are not stored.
+
+        Args:
+            players_frames: The data frames returned by ``get_players()`` before they are formatted.
+        """
+        players_df, _, history_df, _ = players_frames
+        if self.__warehouse is None or len(history_df) == 0 \
+                or any(column not in history_df.columns for column in ['round', 'kickoff_time']):
+            return
+
+        await asyncio.get_event_loop().run_in_executor(None, self.__warehouse.append, history_df, players_df)
+
+    @contextmanager
+    def __measure_conversion(self, method: str):
+        """
+        Reports the time spent in the block to the instrumentation as the conversion time of the given method.
+
+        Args:
+            method: The name of the method, e.g. ``get_players``.
+        """
+        start = time.perf_counter()
+        yield
+        self.__instrumentation.on_conversion(method, time.perf_counter() - start)
+
+    async def __convert(self, convert: Callable, json_data, *args) -> List[pd.DataFrame]:
+        """
+        Converts the given results to data frames with the given function. If this instance has a conversion pool and
+        there are more than ``CONVERSION_SHARD_SIZE`` results, they are split into shards that are converted in the pool
+        at the same time and the data frames of the shards are concatenated.
+
+        Args:
+            convert: The module-level function that converts the results to a list of data frames.
+            json_data: The results as a list or keyed by ID.
+            args: The further arguments passed to the function.
+
+        Returns:
+            The data frames with the same indexes as if the results were converted at once.
+        """
+        if self.__conversion_pool is None or len(json_data) <= CONVERSION_SHARD_SIZE:
+            return convert(json_data, *args)
+
+        items = list(json_data.items()) if isinstance(json_data, dict) else json_data
+        shards = [items[start:start + CONVERSION_SHARD_SIZE] for start in range(0, len(items), CONVERSION_SHARD_SIZE)]
+        if isinstance(json_data, dict):
+            shards = [dict(shard) for shard in shards]
+
+        loop = asyncio.get_event_loop()
+        shards_frames = await asyncio.gather(*[loop.run_in_executor(self.__conversion_pool, convert, shard, *args)
+                                               for shard in shards])
+        return [_concat_shards(frames) for frames in zip(*shards_frames)]
+
+    async def __coalesce(self, method: str, args: tuple, create: Callable) -> object:
+        """
+        Runs the coroutine created by the given function unless a call of the given method with the same arguments is
+        already in progress, in which case its result is shared. If a result is shared by more than one caller, each
+        caller receives its own copy, so that the data frames can be modified safely.
+
+        Args:
+            method: The name of the method, e.g. ``get_players``.
+            args: The arguments of the call. Their ``repr()`` is used as part of the key.
+            create: The function that creates the coroutine that computes the result.
+
+        Returns:
+            The result of the coroutine.
+        """
+        key = (method, repr(args))
+        call = self.__in_flight.get(key)
+        if call is None or call['task'].done():
+            call = {'task': asyncio.ensure_future(create()), 'callers': 0}
+            self.__in_flight[key] = call
+
+            def remove(_):
+                if self.__in_flight.get(key) is call:
+                    del self.__in_flight[key]
+
+            call['task'].add_done_callback(remove)
+
+        # Callers can only join while the task is in progress, so their number is final once the result is available.
+        call['callers'] += 1
+        result = await asyncio.shield(call['task'])
+        return result if call['callers'] == 1 else _copy_result(result)
+
+    async def __get_user_id(self) -> int:
+        """
+        Gets the ID of the currently logged in user. If it has not been cached yet, it retrieves it and stores it for the lifetime of this object. This method requires that a valid email and password are set using the constructor.
+
+        Returns:
+            The user ID.
+        """
+        if self.__user_id is None:
+            self.__user_id = (await self.get_user_info()).iloc[0]['entry']
+
+        return self.__user_id
+
+    def set_cred(self, email: str, password: str) -> None:
+        """ See ``FPLPandas.set_cred()``.
+        """
+        self.__email = email
+        self.__password = password
+        self.__user_id = None
+        self.__logged_in_at = None
+
+    async def refresh(self) -> None:
+        """ See ``FPLPandas.refresh()``.
+        """
+        self.__snapshot_at = None
+        await self.__get_fpl()
+
+    async def get_teams(self, team_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """ See ``FPLPandas.get_teams()``. Concurrent calls with the same arguments share one download and conversion.
+        """
+        return await self.__coalesce('get_teams', (team_ids, columns), lambda: self.__get_teams(team_ids, columns))
+
+    async def __get_teams(self, team_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        json_data = await self.__call_api(lambda fpl: fpl.get_teams(team_ids, return_json=True))
+        with self.__measure_conversion('get_teams'):
+            return self.__format(_from_records(json_data, ['id'], columns), 'teams')
+
+    async def get_game_weeks(self, game_week_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """ See ``FPLPandas.get_game_weeks()``. Concurrent calls with the same arguments share one download and conversion.
+        """
+        return await self.__coalesce('get_game_weeks', (game_week_ids, columns), lambda: self.__get_game_weeks(game_week_ids, columns))
+
+    async def __get_game_weeks(self, game_week_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        json_data = await self.__call_api(lambda fpl: fpl.get_gameweeks(game_week_ids, return_json=True))
+        with self.__measure_conversion('get_game_weeks'):
+            return self.__format(_from_records(json_data, ['id'], columns), 'game_weeks')
+
+    async def get_player(self, player_id: int, columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ See ``FPLPandas.get_player()``. Concurrent calls with the same arguments share one download and conversion.
+        """
+        return await self.__coalesce('get_player', (player_id, columns), lambda: self.__get_player(player_id, columns))
+
+    async def __get_player(self, player_id: int, columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        json_data = await self.__call_api(lambda fpl: fpl.get_player(player_id, players=None, include_summary=True, return_json=True))
+        with self.__measure_conversion('get_player'):
+            columns = columns or {}
+            return self.__format_players([_from_records([json_data], ['id'], columns.get('players')).rename(index={'id': 'player_id'}),
+                                          _convert_players_df([json_data], 'history_past', 'season_name', columns.get('players_history_past')),
+                                          _convert_players_df([json_data], 'history', 'fixture', columns.get('players_history')),
+                                          _convert_players_df([json_data], 'fixtures', 'event', columns.get('players_fixtures'))])
+
+    async def get_players(self, player_ids: List[int] = None, incremental: bool = False,
+                          columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ See ``FPLPandas.get_players()``. Concurrent calls with the same arguments share one download and conversion.
+        """
+        return await self.__coalesce('get_players', (player_ids, incremental, columns),
+                                     lambda: self.__get_players(player_ids, incremental, columns))
+
+    async def __get_players(self, player_ids: List[int] = None, incremental: bool = False,
+                            columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        if incremental:
+            return await self.__get_players_incremental(player_ids, columns)
+
+        full_json_data = await self.__call_api(lambda fpl: fpl.get_players(player_ids, include_summary=True, return_json=True))
+        with self.__measure_conversion('get_players'):
+            players_frames = await self.__convert(_convert_players, full_json_data, columns)
+            formatted_frames = self.__format_players(players_frames)
+
+        await self.__store_history(players_frames)
+        return formatted_frames
+
+    async def __get_players_incremental(self, player_ids: List[int] = None,
+                                        columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """
+        Gets the players like ``get_players()`` but only downloads the summaries of the players that have changed since
+        the previous call of this method with the same ``player_ids`` and ``columns``.
+
+        Args:
+            player_ids: (optional) A list of player IDs
+            columns: (optional) The columns of each data frame.
+
+        Returns:
+            The same data frames as ``get_players()``.
+        """
+        elements, fixtures = await asyncio.gather(
+            self.__call_api(lambda fpl: fpl.get_players(player_ids, include_summary=False, return_json=True)),
+            self.__call_api(lambda fpl: fpl.get_fixtures(return_json=True)))
+        team_fixtures = _get_team_fixture_keys(fixtures)
+
+        state = self.__players_state
+        if state is None or state['player_ids'] != player_ids or state['columns'] != columns:
+            state = None
+            changed_ids = [element['id'] for element in elements]
+        else:
+            changed_ids = _get_changed_player_ids(state, elements, team_fixtures)
+
+        summaries = []
+        if len(changed_ids) > 0:
+            summaries = await self.__call_api(lambda fpl: fpl.get_players(changed_ids, include_summary=True, return_json=True))
+
+        with self.__measure_conversion('get_players'):
+            projection = columns or {}
+            players_frames = [_from_records(elements, ['id'], projection.get('players')).rename(index={'id': 'player_id'}),
+                              _convert_players_df(summaries, 'history_past', 'season_name', projection.get('players_history_past')),
+                              _convert_players_df(summaries, 'history', 'fixture', projection.get('players_history')),
+                              _convert_players_df(summaries, 'fixtures', 'event', _with_kickoff_time(projection.get('players_fixtures')))]
+            if state is not None:
+                player_ids_set = {element['id'] for element in elements}
+                players_frames[1:] = [_merge_players_df(previous_df, df, player_ids_set, set(changed_ids))
+                                      for previous_df, df in zip(state['frames'][1:], players_frames[1:])]
+
+            self.__players_state = {'player_ids': player_ids,
+                                    'columns': columns,
+                                    'elements': {element['id']: _get_incremental_key(element) for element in elements},
+                                    'next_kickoffs': _get_next_kickoffs(players_frames[3]),
+                                    'team_fixtures': team_fixtures,
+                                    'frames': players_frames}
+
+            players_frames = [df.copy() for df in players_frames]
+            if projection.get('players_fixtures') is not None and 'kickoff_time' not in projection['players_fixtures']:
+                players_frames[3] = players_frames[3].drop(columns=['kickoff_time'])
+
+            formatted_frames = self.__format_players(players_frames)
+
+        await self.__store_history(players_frames)
+        return formatted_frames
+
+    async def iter_players(self, player_ids: List[int] = None, batch_size: int = 50,
+                           columns: Dict[str, List[str]] = None) -> AsyncIterator[List[pd.DataFrame]]:
+        """ See ``FPLPandas.iter_players()``. At most twice ``batch_size`` summaries are downloaded ahead of the consumer.
+        """
+        elements = await self.__call_api(lambda fpl: fpl.get_players(player_ids, include_summary=False, return_json=True))
+        remaining_ids = iter([element['id'] for element in elements])
+        pending = set()
+        json_data = []
+
+        def schedule():
+            for player_id in itertools.islice(remaining_ids, 2 * batch_size - len(pending) - len(json_data)):
+                pending.add(asyncio.ensure_future(self.__call_api(
+                    lambda fpl, player_id=player_id: fpl.get_player(player_id, players=None, include_summary=True, return_json=True))))
+
+        try:
+            schedule()
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                json_data.extend(task.result() for task in done)
+
+                while len(json_data) >= batch_size:
+                    batch, json_data = json_data[:batch_size], json_data[batch_size:]
+                    with self.__measure_conversion('iter_players'):
+                        players_frames = _convert_players(batch, columns)
+                        formatted_frames = self.__format_players(players_frames)
+                    await self.__store_history(players_frames)
+                    yield formatted_frames
+
+                schedule()
+
+            if len(json_data) > 0:
+                with self.__measure_conversion('iter_players'):
+                    players_frames = _convert_players(json_data, columns)
+                    formatted_frames = self.__format_players(players_frames)
+                await self.__store_history(players_frames)
+                yield formatted_frames
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_fixtures(self, columns: List[str] = None, events: List[int] = None) -> pd.DataFrame:
+        """ See ``FPLPandas.get_fixtures()``. Concurrent calls with the same arguments share one download and conversion.
+        """
+        return await self.__coalesce('get_fixtures', (columns, events), lambda: self.__get_fixtures(columns, events))
+
+    async def __get_fixtures(self, columns: List[str] = None, events: List[int] = None) -> pd.DataFrame:
+        if events is None:
+            json_data = await self.__call_api(lambda fpl: fpl.get_fixtures(return_json=True))
+            self.__cache_finished_fixtures(json_data)
+        else:
+            json_data = await self.__get_fixtures_by_events(events)
+
+        with self.__measure_conversion('get_fixtures'):
+            return self.__format(_from_records(json_data, ['id'], columns), 'fixtures')
+
+    async def __get_fixtures_by_events(self, events: List[int]) -> List[dict]:
+        """
+        Gets the fixtures of the given game weeks. Only the game weeks that are not in the cache of finished game weeks
+        are downloaded.
+
+        Args:
+            events: The IDs of the game weeks.
+
+        Returns:
+            The fixtures of the game weeks in the given order.
+        """
+        missing_events = [event for event in dict.fromkeys(events) if event not in self.__finished_fixtures]
+        downloaded = await asyncio.gather(*[
+            self.__call_api(lambda fpl, event=event: fpl.get_fixtures_by_gameweek(event, return_json=True))
+            for event in missing_events])
+
+        fixtures = dict(zip(missing_events, downloaded))
+        for event, event_fixtures in fixtures.items():
+            if _is_finished(event_fixtures):
+                self.__finished_fixtures[event] = event_fixtures
+
+        return [fixture for event in dict.fromkeys(events)
+                for fixture in self.__finished_fixtures.get(event, fixtures.get(event, []))]
+
+    def __cache_finished_fixtures(self, fixtures: List[dict]) -> None:
+        """
+        Adds the game weeks of the given fixtures whose fixtures have all finished to the cache of finished game weeks.
+
+        Args:
+            fixtures: The fixtures of the whole season.
+        """
+        fixtures_by_event = {}
+        for fixture in fixtures:
+            fixtures_by_event.setdefault(fixture.get('event'), []).append(fixture)
+
+        self.__finished_fixtures.update({event: event_fixtures for event, event_fixtures in fixtures_by_event.items()
+                                         if event is not None and _is_finished(event_fixtures)})
+
+    async def poll_live(self, event: int = None, interval: float = 60.0, state: LiveState = None,
+                        max_polls: int = None) -> AsyncIterator[pd.DataFrame]:
+        """ See ``FPLPandas.poll_live()``.
+        """
+        # The FPL instance is only resolved once, so that polling does not download bootstrap-static again whenever the
+        # snapshot expires.
+        fpl = await self.__get_fpl()
+        if event is None:
+            event = fpl.current_gameweek
+
+        state = LiveState() if state is None else state
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            if polls > 0:
+                await asyncio.sleep(interval)
+
+            json_data = await fpl.get_gameweek_live(event)
+            polls += 1
+            with self.__measure_conversion('poll_live'):
+                delta_df = state.update(json_data['elements'])
+
+            if len(delta_df) > 0:
+                yield delta_df
+
+    async def get_user_team(self, user_id: int = None, columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ See ``FPLPandas.get_user_team()``.
+        """
+        if user_id is None:
+            user_id = await self.__get_user_id()
+
+        json_data = await self.__call_api(lambda fpl: fpl.get_user_team(user_id), requires_login=True)
+        with self.__measure_conversion('get_user_team'):
+            columns = columns or {}
+            return [self.__format(_from_records(json_data['picks'], ['element'], columns.get('picks')).rename(index={'element': 'player_id'}), 'user_team_picks'),
+                    pd.DataFrame.from_records(json_data['chips'], columns=columns.get('chips')),
+                    pd.DataFrame.from_records([json_data['transfers']], columns=columns.get('transfers'))]
+
+    async def get_user_info(self, columns: List[str] = None) -> pd.DataFrame:
+        """ See ``FPLPandas.get_user_info()``.
+        """
+        json_data = await self.__call_api(lambda fpl: fpl.get_user_info(), requires_login=True)
+        self.__user_id = json_data['player']['entry']
+        with self.__measure_conversion('get_user_info'):
+            return pd.DataFrame.from_records([json_data['player']], columns=columns)
+
+    async def get_user_teams(self, user_ids: List[int], max_concurrency: int = 10,
+                             columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ See ``FPLPandas.get_user_teams()``.
+        """
+        json_data, errors_df = await self.__call_api_for_users(
+            user_ids, lambda fpl, user_id: fpl.get_user_team(user_id), ['picks', 'chips', 'transfers'], max_concurrency,
+            requires_login=True)
+
+        with self.__measure_conversion('get_user_teams'):
+            picks_df, chips_df, transfers_df = await self.__convert(_convert_user_teams, json_data, columns or {})
+            return [self.__format(picks_df, 'user_team_picks'), chips_df, transfers_df, errors_df]
+
+    async def get_user_picks(self, user_ids: List[int], event: int, max_concurrency: int = 10,
+                             columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ See ``FPLPandas.get_user_picks()``.
+        """
+        json_data, errors_df = await self.__call_api_for_users(
+            user_ids, lambda fpl, user_id: fpl.get_user_picks(user_id, event), ['picks', 'entry_history'], max_concurrency)
+
+        with self.__measure_conversion('get_user_picks'):
+            picks_df, entry_history_df = await self.__convert(_convert_user_picks, json_data, columns or {})
+            return [self.__format(picks_df, 'user_team_picks'), entry_history_df, errors_df]
+
+    async def get_user_histories(self, user_ids: List[int], max_concurrency: int = 10,
+                                 columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+        """ See ``FPLPandas.get_user_histories()``.
+        """
+        json_data, errors_df = await self.__call_api_for_users(
+            user_ids, lambda fpl, user_id: fpl.get_user_history(user_id), ['current', 'past', 'chips'], max_concurrency)
+
+        with self.__measure_conversion('get_user_histories'):
+            return await self.__convert(_convert_user_histories, json_data, columns or {}) + [errors_df]
+
+    async def __call_api_for_users(self, user_ids: List[int], func, elements: List[str], max_concurrency: int,
+                                   requires_login: bool = False) -> tuple:
+        """ Calls the given FPL API function for each of the given users concurrently. A user whose call fails or whose
+        response lacks any of the given elements is reported as an error instead of failing the whole call. If the
+        calls require authentication, the login happens once before the calls and its errors fail the whole call.
+
+        Args:
+            user_ids: The IDs of the users.
+            func: The API function to execute. It is passed the FPL instance and the user ID.
+            elements: The elements each response must contain.
+            max_concurrency: The maximum number of calls executed at the same time.
+            requires_login: Whether the calls require authentication.
+
+        Returns:
+            1: The responses keyed by user ID.
+            2: The errors as a pandas data frame indexed by ``user_id``.
+        """
+        # Missing credentials and failed logins are raised once instead of being reported for each user.
+        if requires_login:
+            await self.__prepare_fpl(requires_login)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        json_data = {}
+        errors = []
+
+        async def call_api(user_id: int):
+            async with semaphore:
+                try:
+                    user_json = await self.__call_api(lambda fpl: func(fpl, user_id), requires_login)
+                except Exception as e:
+                    errors.append({'user_id': user_id, 'error': str(e) or type(e).__name__})
+                    return
+
+            missing = [element for element in elements if not isinstance(user_json, dict) or element not in user_json]
+            if len(missing) > 0:
+                detail = user_json.get('detail', user_json) if isinstance(user_json, dict) else user_json
+                errors.append({'user_id': user_id, 'error': f'Unexpected response: {detail}'})
+            else:
+                json_data[user_id] = user_json
+
+        await asyncio.gather(*[call_api(user_id) for user_id in user_ids])
+
+        errors_df = pd.DataFrame.from_records(errors, columns=['user_id', 'error']).set_index('user_id')
+        return {user_id: json_data[user_id] for user_id in user_ids if user_id in json_data}, errors_df
+
+    async def save_snapshot(self, path: str, file_format: str = 'arrow') -> str:
+        """ See ``FPLPandas.save_snapshot()``.
+        """
+        teams, game_weeks, fixtures, players = await asyncio.gather(
+            self.get_teams(), self.get_game_weeks(), self.get_fixtures(), self.get_players())
+
+        frames = {'teams': teams, 'game_weeks': game_weeks, 'fixtures': fixtures, **dict(zip(PLAYERS_FRAMES, players))}
+        return await asyncio.get_event_loop().run_in_executor(None, save_snapshot, frames, path, file_format)
+
+
+# Helper methods
+def _run_event_loop(loop: asyncio.AbstractEventLoop, api: 'AsyncFPLPandas') -> None:
+    """
+    Runs the given event loop until it is stopped, then cancels the calls still in progress and closes the HTTP session
+    of the given API and the loop.
+    """
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(api.close())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def _copy_result(result: object) -> object:
+    """
+    Returns a deep copy of the given data frame or list of data frames.
+    """
+    if isinstance(result, list):
+        return [df.copy() for df in result]
+
+    return result.copy()
+
+
+def _convert_players(json_data: List[dict], columns: Dict[str, List[str]] = None) -> List[pd.DataFrame]:
+    """
+    Converts the given players including their summary data into the data frames returned by ``get_players()``.
+
+    Args:
+        json_data: The players including their summary data.
+        columns: (optional) The columns of each data frame keyed by its name in ``PLAYERS_FRAMES``.
+
+    Returns:
+        The players, past seasons, completed games and upcoming fixtures data frames.
+    """
+    columns = columns or {}
+    return [_from_records(json_data, ['id'], columns.get('players'), exclude=['history_past', 'history', 'fixtures']).rename(index={'id': 'player_id'}),
+            _convert_players_df(json_data, 'history_past', 'season_name', columns.get('players_history_past')),
+            _convert_players_df(json_data, 'history', 'fixture', columns.get('players_history')),
+            _convert_players_df(json_data, 'fixtures', 'event', columns.get('players_fixtures'))]
+
+
+def _convert_players_df(json_data: List[dict], element: str, index: str, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Converts the given nested list of all players into one data frame indexed by ``player_id`` and ``index``. The records
+    of all players are flattened in one pass so that the data frame is only constructed once.
+
+    Args:
+        json_data: The players including their summary data.
+        element: The name of the nested list to convert, e.g. ``history``.
+        index: The column that identifies a record within the nested list of a player.
+        columns: (optional) The columns to keep besides the index. If set, only these fields are taken from the records.
+
+    Returns:
+        The data frame with the records of all players.
+    """
+    if columns is None:
+        records = [{**record, 'player_id': player['id']} for player in json_data for record in player[element]]
+        return pd.DataFrame.from_records(records).pipe(_set_index_safe, ['player_id', index])
+
+    fields = [index] + [column for column in columns if column not in ('player_id', index)]
+    rows = [(player['id'], *[record.get(field) for field in fields]) for player in json_data for record in player[element]]
+    return pd.DataFrame.from_records(rows, columns=['player_id'] + fields).set_index(['player_id', index])
+
+
+def _from_records(records: List[dict], index: List[str], columns: List[str] = None, exclude: List[str] = None) -> pd.DataFrame:
+    """
+    Converts the given records into a data frame with the given index. If columns are given, only these fields are taken
+    from the records.
+
+    Args:
+        records: The records to convert.
+        index: The columns to use as the index.
+        columns: (optional) The columns to keep besides the index. If not set, all fields are kept.
+        exclude: (optional) The fields to skip if all fields are kept.
+
+    Returns:
+        The data frame.
+    """
+    if columns is None:
+        return pd.DataFrame.from_records(records, index=index, exclude=exclude)
+
+    return (pd.DataFrame.from_records(records, columns=index + [column for column in columns if column not in index])
+            .set_index(index))
+
+
+def _with_kickoff_time(columns: List[str]) -> List[str]:
+    """
+    Returns the given columns of the upcoming fixtures including ``kickoff_time``, which incremental mode requires.
+    """
+    return columns if columns is None or 'kickoff_time' in columns else columns + ['kickoff_time']
+
+
+def _convert_users_df(json_data: Dict[int, dict], element: str, index: List[str] = None,
+                      columns: List[str] = None) -> pd.DataFrame:
+    """
+    Converts the given nested list of all users into one data frame indexed by ``user_id`` and the given columns. The
+    ``element`` column of picks is renamed to ``player_id``.
+
+    Args:
+        json_data: The responses keyed by user ID.
+        element: The name of the nested list to convert, e.g. ``picks``.
+        index: (optional) The columns that identify a record within the nested list of a user.
+        columns: (optional) The columns to keep besides the index. If set, only these fields are taken from the records.
+
+    Returns:
+        The data frame with the records of all users.
+    """
+    index = index or []
+    if columns is None:
+        records = [{**record, 'user_id': user_id} for user_id, user_json in json_data.items() for record in user_json[element]]
+        return (pd.DataFrame.from_records(records)
+                .rename(columns={'element': 'player_id'})
+                .pipe(_set_index_safe, ['user_id'] + index))
+
+    names = index + [column for column in columns if column not in ['user_id'] + index]
+    fields = ['element' if name == 'player_id' else name for name in names]
+    rows = [(user_id, *[record.get(field) for field in fields])
+            for user_id, user_json in json_data.items() for record in user_json[element]]
+    return pd.DataFrame.from_records(rows, columns=['user_id'] + names).set_index(['user_id'] + index)
+
+
+def _convert_user_teams(json_data: Dict[int, dict], columns: Dict[str, List[str]]) -> List[pd.DataFrame]:
+    """
+    Converts the given user teams into the picks, chips and transfers data frames returned by ``get_user_teams()``.
+    """
+    return [_convert_users_df(json_data, 'picks', ['player_id'], columns.get('picks')),
+            _convert_users_df(json_data, 'chips', columns=columns.get('chips')),
+            _convert_users_df({user_id: {'transfers': [user_json['transfers']]} for user_id, user_json in json_data.items()}, 'transfers',
+                              columns=columns.get('transfers'))]
+
+
+def _convert_user_picks(json_data: Dict[int, dict], columns: Dict[str, List[str]]) -> List[pd.DataFrame]:
+    """
+    Converts the given picks of a game week into the picks and entry history data frames returned by
+    ``get_user_picks()``.
+    """
+    return [_convert_users_df(json_data, 'picks', ['player_id'], columns.get('picks')),
+            _convert_users_df({user_id: {'entry_history': [user_json['entry_history']]} for user_id, user_json in json_data.items()}, 'entry_history',
+                              columns=columns.get('entry_history'))]
+
+
+def _convert_user_histories(json_data: Dict[int, dict], columns: Dict[str, List[str]]) -> List[pd.DataFrame]:
+    """
+    Converts the given user histories into the game weeks, past seasons and chips data frames returned by
+    ``get_user_histories()``.
+    """
+    return [_convert_users_df(json_data, 'current', ['event'], columns.get('current')),
+            _convert_users_df(json_data, 'past', ['season_name'], columns.get('past')),
+            _convert_users_df(json_data, 'chips', columns=columns.get('chips'))]
+
+
+def _concat_shards(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates the data frames converted from consecutive shards of results. Empty data frames are skipped unless all
+    of them are empty, so that they do not change the data types of the columns. A column whose values are all missing
+    in one shard has the ``object`` type in that shard, so the types of the ``object`` columns are inferred again, as
+    they would be if the results were converted at once.
+    """
+    return pd.concat([df for df in frames if df.shape[0] > 0] or frames[:1], sort=False).infer_objects()
+
+
+def _is_finished(fixtures: List[dict]) -> bool:
+    """
+    Checks whether all of the given fixtures of a game week have finished, so that they do not change anymore.
+    """
+    return len(fixtures) > 0 and all(fixture.get('finished') is True for fixture in fixtures)
+
+
+def _get_incremental_key(element: dict) -> tuple:
+    return tuple(element.get(field) for field in INCREMENTAL_FIELDS)
+
+
+def _get_next_kickoffs(fixtures_df: pd.DataFrame) -> pd.Series:
+    """
+    Gets the kick-off time of the next fixture of each player from the upcoming fixtures data frame.
+
+    Args:
+        fixtures_df: The upcoming fixtures indexed by ``player_id``, ``event``.
+
+    Returns:
+        The kick-off times indexed by ``player_id``. It is empty if the fixtures have no ``kickoff_time`` column.
+    """
+    if 'kickoff_time' not in fixtures_df.columns:
+        return pd.Series(dtype='datetime64[ns, UTC]')
+
+    return pd.to_datetime(fixtures_df['kickoff_time'], utc=True).groupby(level='player_id').min().dropna()
+
+
+def _get_team_fixture_keys(fixtures: List[dict]) -> Dict[int, tuple]:
+    """
+    Gets a key of the upcoming fixtures of each team that changes when one of them is rescheduled or re-rated.
+
+    Args:
+        fixtures: All fixtures of the season as returned by the fixtures endpoint.
+
+    Returns:
+        The keys indexed by team ID.
+    """
+    team_fixtures = {}
+    for fixture in fixtures:
+        if fixture.get('finished') is True:
+            continue
+
+        for team, difficulty in [('team_h', 'team_h_difficulty'), ('team_a', 'team_a_difficulty')]:
+            team_fixtures.setdefault(fixture.get(team), []).append(
+                (fixture.get('id'), fixture.get('event'), fixture.get('kickoff_time'),
+                 fixture.get('provisional_start_time'), fixture.get(difficulty)))
+
+    return {team: tuple(sorted(keys, key=repr)) for team, keys in team_fixtures.items()}
+
+
+def _get_changed_player_ids(state: dict, elements: List[dict], team_fixtures: Dict[int, tuple]) -> List[int]:
+    """
+    Gets the IDs of the players whose summary must be downloaded again. These are new players, players whose
+    ``INCREMENTAL_FIELDS`` have changed, players whose next fixture has kicked off since the summary was downloaded and
+    players whose team has an upcoming fixture that was rescheduled or re-rated.
+
+    Args:
+        state: The state recorded by the previous incremental call of ``get_players()``.
+        elements: The players from the current bootstrap-static snapshot.
+        team_fixtures: The keys of the current upcoming fixtures of each team as returned by ``_get_team_fixture_keys()``.
+
+    Returns:
+        The IDs of the changed players.
+    """
+    now = pd.Timestamp.now(tz='UTC')
+    kicked_off_ids = set(state['next_kickoffs'][state['next_kickoffs'] <= now].index)
+    changed_teams = {team for team in set(team_fixtures) | set(state['team_fixtures'])
+                     if team_fixtures.get(team) != state['team_fixtures'].get(team)}
+
+    return [element['id'] for element in elements
+            if element['id'] in kicked_off_ids or element.get('team') in changed_teams
+            or state['elements'].get(element['id']) != _get_incremental_key(element)]
+
+
+def _merge_players_df(previous_df: pd.DataFrame, df: pd.DataFrame, player_ids: set, changed_ids: set) -> pd.DataFrame:
+    """
+    Replaces the rows of the changed players in the previous data frame with the rows of the given one and drops the
+    rows of players that no longer exist.
+
+    Args:
+        previous_df: The data frame of the previous result indexed by ``player_id`` and one other column.
+        df: The data frame with the rows of the changed players.
+        player_ids: The IDs of all current players.
+        changed_ids: The IDs of the changed players.
+
+    Returns:
+        The merged data frame ordered by ``player_id``.
+    """
+    previous_ids = previous_df.index.get_level_values('player_id')
+    kept_df = previous_df[previous_ids.isin(player_ids) & ~previous_ids.isin(changed_ids)]
+    merged_df = pd.concat([part_df for part_df in [kept_df, df] if part_df.shape[0] > 0] or [previous_df.iloc[:0]], sort=False)
+
+    order = np.argsort(merged_df.index.get_level_values('player_id').values, kind='stable')
+    return merged_df.iloc[order]
+
+
+def _set_index_safe(df: pd.DataFrame, index_columns: list) -> pd.DataFrame:
+    """
+    Sets the given columns as the index but only if the given data frame is not empty or None.
+
+    Args:
+         df: Data frame to index
+         index_columns: Index columns to set
+
+    Returns:
+        Index data frame is not empty otherwise it returns the original data frame.
+    """
+    # if df is None or df.shape[0] == 0:
+    #    return df
+
+    cols = list(df.columns.values)
+    return (df
+            .reindex(columns=(cols + [col for col in index_columns if col not in cols]))
+            .set_index(index_columns))
@@ -0,0 +1,216 @@
+from fpl.constants import API_URLS
+from fpl.models.fixture import Fixture
+from fpl.utils import fetch, logged_in
+from fpl import FPL
+
+from .http import Session
+
+
+# Extension methods for FPL. These are necessary because FPL does not expose all available data.
+async def __fpl_get_user_team(self, user_id: str) -> dict:
+    """Gets current team, the chips and the transfer info of the logged in user. Requires the user to have
+    logged in using ``fpl.login()``.
+
+    Information is taken from:
+        https://fantasy.premierleague.com/api/my-team/91928/
+
+    Args:
+        user_id: The user ID for which to get the team information. If not provided, it defaults to the user ID of currently authenticated user.
+
+    Returns:
+        Current team, the chips and the transfer info as data frames.
+    """
+    if not logged_in(self.session):
+        raise Exception("User must be logged in.")
+
+    response = await fetch(
+        self.session, API_URLS["user_team"].format(user_id))
+
+    if response == {"details": "You cannot view this entry"}:
+        raise ValueError("User ID does not match provided email address!")
+
+    return response
+
+
+async def __fpl_get_user_info(self) -> dict:
+    if not logged_in(self.session):
+        raise Exception("User must be logged in.")
+
+    response = await fetch(
+        self.session, API_URLS["me"])
+
+    if response == {"details": "You cannot view this entry"}:
+        raise ValueError("User ID does not match provided email address!")
+
+    return response
+
+
+async def __fpl_get_user_picks(self, user_id: int, event: int) -> dict:
+    """Gets the picks, the automatic substitutions and the game week history of the user with the given user ID for the
+    given game week.
+
+    Information is taken from e.g.:
+        https://fantasy.premierleague.com/api/entry/91928/event/1/picks/
+
+    Args:
+        user_id: The user ID.
+        event: The game week ID.
+
+    Returns:
+        The picks of the user for the game week.
+    """
+    return await fetch(self.session, API_URLS["user_picks"].format(user_id, event))
+
+
+async def __fpl_get_user_history(self, user_id: int) -> dict:
+    """Gets the game weeks of the current season, the past seasons and the chips played of the user with the given user ID.
+
+    Information is taken from e.g.:
+        https://fantasy.premierleague.com/api/entry/91928/history/
+
+    Args:
+        user_id: The user ID.
+
+    Returns:
+        The history of the user.
+    """
+    return await fetch(self.session, API_URLS["user_history"].format(user_id))
+
+
+async def __fpl_get_gameweek_live(self, gameweek_id: int) -> dict:
+    """Gets the live stats of all players in the game week with the given ID.
+
+    Information is taken from e.g.:
+        https://fantasy.premierleague.com/api/event/1/live
+
+    Args:
+        gameweek_id: The game week ID.
+
+    Returns:
+        The live stats of the players in ``elements``.
+    """
+    return await fetch(self.session, API_URLS["gameweek_live"].format(gameweek_id))
+
+
+async def __fpl_refresh(self) -> None:
+    """Downloads bootstrap-static and sets its content as attributes the same way as ``FPL.__init__`` does, e.g.
+    ``elements``, ``teams`` and ``events`` keyed by ID. Unlike ``FPL.__init__``, it uses the session of the FPL instance.
+
+    Information is taken from:
+        https://fantasy.premierleague.com/api/bootstrap-static/
+    """
+    static = await fetch(self.session, API_URLS["static"])
+
+    for k, v in static.items():
+        try:
+            v = {w["id"]: w for w in v}
+        except (KeyError, TypeError):
+            pass
+        setattr(self, k, v)
+
+    self.current_gameweek = next((event["id"] for event in static.get("events", []) if event["is_current"]), 0)
+
+
+# Overriding fpl method for now because it does not return fixtures without game weeks.
+async def __fpl_get_fixtures(self, return_json=False):
+    """Returns a list of *all* fixtures.
+
+    Information is taken from e.g.:
+        https://fantasy.premierleague.com/api/fixtures/
+        https://fantasy.premierleague.com/api/fixtures/?event=1
+
+    :param return_json: (optional) Boolean. If ``True`` returns a list of
+        ``dict``s, if ``False`` returns a list of  :class:`Fixture`
+        objects. Defaults to ``False``.
+    :type return_json: bool
+    :rtype: list
+    """
+    fixtures = await fetch(self.session, API_URLS["fixtures"])
+
+    if return_json:
+        return fixtures
+
+    return [Fixture(fixture) for fixture in fixtures]
+
+
+
+# Helper methods
+def _create_fpl(session: Session) -> FPL:
+    """
+    Creates an FPL instance without downloading bootstrap-static synchronously like ``FPL.__init__`` does.
+    ``FPL.refresh()`` must be awaited before the instance is used.
+
+    Args:
+        session: The HTTP session to use.
+
+    Returns:
+        The FPL instance.
+    """
+    fpl = FPL.__new__(FPL)
+    fpl.session = session
+    return fpl
+
+
+def _index_by_id(records) -> dict:
+    """
+    Returns the given records keyed by their ``id``. The bootstrap-static lists of an FPL instance, e.g. ``elements``,
+    are already stored keyed by ID once per snapshot and are therefore returned as they are.
+
+    Args:
+        records: A list of records or a ``dict`` of records keyed by ID.
+
+    Returns:
+        The records keyed by ID.
+    """
+    if isinstance(records, dict):
+        return records
+
+    return {record["id"]: record for record in records}
+
+
+async def __get_player(self, player_id, players=None, include_summary=False,
+                       return_json=False):
+    """Returns the player with the given ``player_id``.
+
+    Information is taken from e.g.:
+        https://fantasy.premierleague.com/api/bootstrap-static/
+        https://fantasy.premierleague.com/api/element-summary/1/ (optional)
+
+    :param player_id: A player's ID.
+    :type player_id: string or int
+    :param players: (optional) A list of players or a ``dict`` of players
+        keyed by ID like the ``elements`` attribute. Defaults to ``elements``.
+    :param bool include_summary: (optional) Includes a player's summary
+        if ``True``.
+    :param return_json: (optional) Boolean. If ``True`` returns a ``dict``,
+        if ``False`` returns a :class:`Player` object. Defaults to
+        ``False``.
+    :rtype: :class:`Player` or ``dict``
+    :raises ValueError: Player with ``player_id`` not found
+    """
+    if not players:
+        players = getattr(self, "elements")
+
+    player = _index_by_id(players).get(player_id)
+    if player is None:
+        raise ValueError(f"Player with ID {player_id} not found")
+
+    if include_summary:
+        player_summary = await self.get_player_summary(
+            player["id"], return_json=True)
+        player = {**player, **player_summary}
+
+    if return_json:
+        return player
+
+    return FPL.Player(player, self.session)
+
+
+FPL.get_user_team = __fpl_get_user_team
+FPL.get_user_info = __fpl_get_user_info
+FPL.get_user_picks = __fpl_get_user_picks
+FPL.get_user_history = __fpl_get_user_history
+FPL.get_fixtures = __fpl_get_fixtures
+FPL.get_gameweek_live = __fpl_get_gameweek_live
+FPL.get_player = __get_player
+FPL.refresh = __fpl_refresh
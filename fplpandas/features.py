@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# The columns of the completed games from which the features are derived.
+REQUIRED_COLUMNS = ['round', 'kickoff_time', 'total_points', 'minutes', 'value', 'was_home']
+
+# The features derived for each completed game of a player.
+FEATURES = ['form', 'points_per_million', 'minutes_share', 'home_points_per_game', 'away_points_per_game']
+
+
+class PlayerFeatures:
+    """
+    This class derives commonly used features from the completed games of the players, as returned by ``get_players()``
+    in the third data frame. For each game, the features describe the player up to and including that game:
+
+    * ``form``: the average points over the last ``window`` games,
+    * ``points_per_million``: the points of the season per million of the value of the player at the time of the game,
+    * ``minutes_share``: the share of the 90 minutes of each game so far that the player has played,
+    * ``home_points_per_game`` and ``away_points_per_game``: the average points at home and away.
+
+    The features are kept in ``df``, a data frame indexed by ``player_id``, ``fixture``. They are computed for all
+    players at once with vectorised operations. On each update, only the features of the players whose games have
+    changed are computed again.
+    """
+
+    def __init__(self, window: int = 5):
+        """
+        Create a new instance of this class.
+
+        Args:
+            window: The number of games over which ``form`` is averaged.
+        """
+        self.window = window
+        self.df = (pd.DataFrame(columns=['player_id', 'fixture', 'round', 'kickoff_time', 'total_points'] + FEATURES)
+                   .set_index(['player_id', 'fixture']))
+        self.__hashes = pd.Series(dtype=np.uint64)
+
+    def update(self, history_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the given completed games and computes the features of the players whose games are new or have changed.
+        Players who are not in the given games are removed.
+
+        Args:
+            history_df: The completed games of all players indexed by ``player_id``, ``fixture`` as returned by
+            ``get_players()``.
+
+        Returns:
+            The features of the players that were computed again as a pandas data frame indexed by ``player_id``,
+            ``fixture``.
+        Raises:
+            ValueError: The games lack a required column
+        """
+        missing = [column for column in REQUIRED_COLUMNS if column not in history_df.columns]
+        if len(missing) > 0:
+            raise ValueError(f"The features cannot be computed because the history lacks the columns: {', '.join(missing)}.")
+
+        history_df = history_df[REQUIRED_COLUMNS]
+        hashes = pd.util.hash_pandas_object(history_df, index=True).groupby(level='player_id', sort=False).sum()
+        is_changed = ~hashes.index.isin(self.__hashes.index) | (self.__hashes.reindex(hashes.index, fill_value=0) != hashes)
+        changed_ids = hashes.index[is_changed]
+
+        player_ids = history_df.index.get_level_values('player_id')
+        delta_df = _compute_features(history_df[player_ids.isin(changed_ids)], self.window)
+
+        kept_df = self.df[self.df.index.get_level_values('player_id').isin(hashes.index.difference(changed_ids))]
+        merged_df = pd.concat([df for df in [kept_df, delta_df] if len(df) > 0] or [delta_df])
+        order = np.argsort(merged_df.index.get_level_values('player_id').values, kind='stable')
+        self.df = merged_df.iloc[order]
+        self.__hashes = hashes
+
+        return delta_df
+
+
+def _compute_features(history_df: pd.DataFrame, window: int) -> pd.DataFrame:
+    """
+    Computes the features of all games of the given players in one pass. The games of each player are ordered by their
+    kick-off time.
+    """
+    df = (history_df.assign(kickoff_time=pd.to_datetime(history_df['kickoff_time'], utc=True))
+          .sort_values(['player_id', 'kickoff_time'], kind='stable'))
+    player_ids = df.index.get_level_values('player_id')
+    points = df['total_points'].astype(np.float64)
+    # Games without a venue count towards neither the home nor the away split.
+    is_home = df['was_home'].fillna(False).astype(bool)
+    is_away = ~df['was_home'].fillna(True).astype(bool)
+
+    games = _cumsum(pd.Series(1.0, index=df.index), player_ids)
+    total_points = _cumsum(points, player_ids)
+    previous_points = total_points.groupby(player_ids, sort=False).shift(window).fillna(0.0)
+    home_games = _cumsum(is_home.astype(np.float64), player_ids)
+    home_points = _cumsum(points.where(is_home, 0.0), player_ids)
+    away_games = _cumsum(is_away.astype(np.float64), player_ids)
+    away_points = _cumsum(points.where(is_away, 0.0), player_ids)
+
+    return df[['round', 'kickoff_time', 'total_points']].assign(
+        form=(total_points - previous_points) / np.minimum(games, window),
+        points_per_million=total_points / (df['value'].astype(np.float64) / 10.0),
+        minutes_share=_cumsum(df['minutes'].astype(np.float64), player_ids) / (90.0 * games),
+        home_points_per_game=home_points / home_games.replace(0.0, np.nan),
+        away_points_per_game=away_points / away_games.replace(0.0, np.nan))
+
+
+def _cumsum(values: pd.Series, player_ids: pd.Index) -> pd.Series:
+    return values.groupby(player_ids, sort=False).cumsum()
@@ -0,0 +1,406 @@
+import aiohttp
+import asyncio
+import json
+import re
+import time
+from typing import Callable
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from yarl import URL
+
+from .cache import CacheEntry, ResponseCache
+from .metrics import Instrumentation, get_endpoint
+from .replay import ResponseRecorder, rewrite_url
+
+
+# The endpoints that return the data of the logged-in user. Their responses are never cached, so that private data is
+# neither written to disk nor served to another user.
+_PRIVATE_ENDPOINTS = {'me', 'user_team', 'user_latest_transfers', 'transfers', 'watchlist'}
+
+
+class RateLimiter:
+    """
+    This class limits the requests of an ``FPLPandas`` instance with a token bucket and a cap on the number of concurrent
+    requests. The rate adapts to the API: it is halved whenever a request is answered with HTTP 429 and all requests are
+    paused for the time given by the ``Retry-After`` header. After that, every successful request increases the rate
+    again until ``max_rate`` is reached.
+    """
+
+    def __init__(self, rate: float = 20.0, max_rate: float = 50.0, min_rate: float = 1.0, burst: int = 20,
+                 max_concurrency: int = 20, increase: float = 0.5):
+        """
+        Create a new instance of this class.
+
+        Args:
+            rate: The initial number of requests per second.
+            max_rate: The maximum number of requests per second the rate is increased to.
+            min_rate: The minimum number of requests per second the rate is decreased to.
+            burst: The maximum number of requests that can be sent at once after a quiet period.
+            max_concurrency: The maximum number of requests in flight at the same time.
+            increase: The number of requests per second that is added to the rate after each successful request.
+        """
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.__tokens = float(burst)
+        self.__updated_at = time.monotonic()
+        self.__paused_until = 0.0
+        self.__lock = None
+        self.__semaphore = None
+
+    async def acquire(self) -> None:
+        """
+        Waits until a request may be sent. Every call must be followed by a call of ``release()``.
+        """
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.__lock = asyncio.Lock()
+
+        await self.__semaphore.acquire()
+        try:
+            async with self.__lock:
+                await self.__take_token()
+        except BaseException:
+            self.__semaphore.release()
+            raise
+
+    def release(self) -> None:
+        """
+        Frees the concurrency slot taken by ``acquire()``.
+        """
+        self.__semaphore.release()
+
+    def succeeded(self) -> None:
+        """
+        Reports a successful request so that the rate is increased.
+        """
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self, retry_after: float = None) -> None:
+        """
+        Reports a request that was rejected with HTTP 429 so that the rate is decreased and all requests are paused.
+
+        Args:
+            retry_after: The number of seconds to pause as requested by the API. If not set, the pause is the time between
+            two requests at the decreased rate.
+        """
+        self.rate = max(self.min_rate, self.rate / 2)
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self.__paused_until = max(self.__paused_until, time.monotonic() + pause)
+        self.__tokens = 0.0
+
+    async def __take_token(self) -> None:
+        """
+        Waits until the API is not paused and a token is available and then takes it.
+        """
+        while True:
+            now = time.monotonic()
+            if now < self.__paused_until:
+                await asyncio.sleep(self.__paused_until - now)
+                self.__updated_at = time.monotonic()
+                continue
+
+            self.__tokens = min(float(self.burst), self.__tokens + (now - self.__updated_at) * self.rate)
+            self.__updated_at = now
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.__tokens) / self.rate)
+
+
+class Session:
+    """
+    This class wraps an ``aiohttp.ClientSession`` and is passed to the FPL library in its place. GET requests are sent
+    through the rate limiter and retried when they are rejected with HTTP 429. If a response cache is set, GET requests
+    for cached URLs are sent as conditional requests and HTTP 304 responses are served from the cache. The responses of
+    endpoints that return the data of the logged-in user are not cached. If a recorder is set, successful GET responses
+    are captured for ``ReplayServer``. If a base URL is set, requests for the FPL API and its login are sent to that
+    server instead. The requests are reported to the given instrumentation and JSON bodies are decoded with the given
+    function. All other attributes are taken from the wrapped session.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, rate_limiter: RateLimiter = None, max_retries: int = 8,
+                 cache: ResponseCache = None, recorder: ResponseRecorder = None, base_url: str = None,
+                 instrumentation: Instrumentation = None, json_loads: Callable = None):
+        """
+        Create a new instance of this class.
+
+        Args:
+            session: The session to wrap.
+            rate_limiter: The rate limiter to use. If not set, requests are not limited.
+            max_retries: The maximum number of times a request rejected with HTTP 429 is repeated.
+            cache: The response cache to use. If not set, responses are not cached.
+            recorder: The recorder that captures successful GET responses. If not set, responses are not recorded.
+            base_url: The URL of a stand-in server, e.g. a ``ReplayServer``, to send requests to instead of the FPL API.
+            instrumentation: The instrumentation the requests are reported to. If not set, they are not reported.
+            json_loads: The function that decodes JSON bodies, e.g. ``orjson.loads``. It is passed the body as bytes. If
+            not set, ``json.loads`` is used.
+        """
+        self.__session = session
+        self.__rate_limiter = rate_limiter
+        self.__max_retries = max_retries
+        self.__cache = cache
+        self.__recorder = recorder
+        self.__base_url = base_url
+        self.instrumentation = Instrumentation() if instrumentation is None else instrumentation
+        self.__json_loads = json.loads if json_loads is None else json_loads
+
+    def __getattr__(self, name):
+        return getattr(self.__session, name)
+
+    def get(self, url, **kwargs) -> '_Request':
+        """
+        Sends a GET request. The result must be used as an async context manager like the one of
+        ``aiohttp.ClientSession.get()``.
+
+        Args:
+            url: The URL to request.
+            **kwargs: The arguments passed on to ``aiohttp.ClientSession.get()``.
+
+        Returns:
+            The context manager for the response.
+        """
+        if self.__base_url is not None:
+            url = rewrite_url(url, self.__base_url)
+
+        return _Request(self.__session, self.__rate_limiter, self.__max_retries, self.__cache, self.__recorder,
+                        self.instrumentation, self.__json_loads, url, kwargs)
+
+    def post(self, url, **kwargs):
+        """
+        Sends a POST request. The result must be used as an async context manager like the one of
+        ``aiohttp.ClientSession.post()``. If a base URL is set, the cookies set by the stand-in server are stored for the
+        original URL so that the login is detected.
+
+        Args:
+            url: The URL to request.
+            **kwargs: The arguments passed on to ``aiohttp.ClientSession.post()``.
+
+        Returns:
+            The context manager for the response.
+        """
+        if self.__base_url is None:
+            return self.__session.post(url, **kwargs)
+
+        return _RewrittenPost(self.__session, url, rewrite_url(url, self.__base_url), kwargs)
+
+
+class _RewrittenPost:
+    """
+    The async context manager returned by ``Session.post()`` if a base URL is set.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, url, rewritten_url: str, kwargs: dict):
+        self.__session = session
+        self.__url = url
+        self.__rewritten_url = rewritten_url
+        self.__kwargs = kwargs
+        self.__response = None
+
+    async def __aenter__(self):
+        self.__response = await self.__session.post(self.__rewritten_url, **self.__kwargs)
+        self.__session.cookie_jar.update_cookies(self.__response.cookies, URL(str(self.__url)))
+        return self.__response
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__response.release()
+
+
+class _Request:
+    """
+    The async context manager returned by ``Session.get()``.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, rate_limiter: RateLimiter, max_retries: int,
+                 cache: ResponseCache, recorder: ResponseRecorder, instrumentation: Instrumentation,
+                 json_loads: Callable, url, kwargs: dict):
+        self.__session = session
+        self.__rate_limiter = rate_limiter
+        self.__max_retries = max_retries
+        self.__cache = cache
+        self.__recorder = recorder
+        self.__instrumentation = instrumentation
+        self.__json_loads = json_loads
+        self.__endpoint = get_endpoint(url)
+        self.__url = url
+        self.__kwargs = kwargs
+        self.__response = None
+        if self.__endpoint in _PRIVATE_ENDPOINTS:
+            self.__cache = None
+
+    async def __aenter__(self):
+        start = time.perf_counter()
+        loop = asyncio.get_event_loop()
+        entry = None
+        if self.__cache is not None:
+            entry = await loop.run_in_executor(None, self.__cache.get, str(self.__url))
+        kwargs = self.__kwargs
+        if entry is not None:
+            kwargs = {**kwargs, 'headers': {**(kwargs.get('headers') or {}), **entry.validators()}}
+
+        response = await self.__send(kwargs)
+        self.__response = response
+
+        try:
+            if entry is not None and response.status == 304:
+                response.release()
+                self.__response = _CachedResponse(entry, response)
+            elif self.__cache is not None and response.status == 200:
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag is not None or last_modified is not None:
+                    new_entry = CacheEntry(str(self.__url), await response.read(), etag, last_modified,
+                                           response.content_type)
+                    await loop.run_in_executor(None, self.__cache.put, new_entry)
+
+            body = await self.__response.read()
+            if self.__recorder is not None and self.__response.status == 200:
+                self.__recorder.record(str(self.__url), body)
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+
+        status = 304 if isinstance(self.__response, _CachedResponse) else self.__response.status
+        self.__instrumentation.on_request(self.__endpoint, status, 0 if status == 304 else len(body),
+                                          time.perf_counter() - start)
+        return _DecodingResponse(self.__response, body, self.__json_loads, self.__instrumentation, self.__endpoint)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.__response.release()
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.release()
+
+    async def __send(self, kwargs: dict) -> aiohttp.ClientResponse:
+        """
+        Sends the request through the rate limiter and repeats it if it is rejected with HTTP 429. Unless no rate limiter
+        is set, the concurrency slot taken for the returned response is only freed in ``__aexit__()``.
+        """
+        if self.__rate_limiter is None:
+            return await self.__session.get(self.__url, **kwargs)
+
+        for attempt in range(self.__max_retries + 1):
+            start = time.perf_counter()
+            await self.__rate_limiter.acquire()
+            self.__instrumentation.on_wait('rate_limit', time.perf_counter() - start)
+            try:
+                response = await self.__session.get(self.__url, **kwargs)
+            except BaseException:
+                self.__rate_limiter.release()
+                raise
+
+            if response.status != 429:
+                self.__rate_limiter.succeeded()
+                return response
+
+            self.__rate_limiter.throttled(_parse_retry_after(response.headers.get('Retry-After')))
+            if attempt == self.__max_retries:
+                return response
+
+            response.release()
+            self.__rate_limiter.release()
+            self.__instrumentation.on_retry(self.__endpoint, 'throttled')
+
+
+class _DecodingResponse:
+    """
+    A response whose body has already been read and whose JSON is decoded from the bytes with the configured function
+    instead of being decoded to a string first. The decoding time is reported to the instrumentation. All other
+    attributes are taken from the wrapped response.
+    """
+
+    def __init__(self, response, body: bytes, json_loads: Callable, instrumentation: Instrumentation, endpoint: str):
+        self.__response = response
+        self.__body = body
+        self.__json_loads = json_loads
+        self.__instrumentation = instrumentation
+        self.__endpoint = endpoint
+
+    def __getattr__(self, name):
+        return getattr(self.__response, name)
+
+    async def json(self, *, encoding: str = None, loads=None, content_type: str = 'application/json'):
+        if content_type is not None and not _is_expected_content_type(self.__response.content_type, content_type):
+            raise aiohttp.ContentTypeError(getattr(self.__response, 'request_info', None),
+                                           getattr(self.__response, 'history', ()),
+                                           message=f'Attempt to decode JSON with unexpected mimetype: {self.__response.content_type}')
+
+        if not self.__body.strip():
+            return None
+
+        start = time.perf_counter()
+        if loads is not None:
+            json_data = loads(self.__body.decode(encoding or 'utf-8'))
+        else:
+            json_data = self.__json_loads(self.__body)
+        self.__instrumentation.on_decode(self.__endpoint, time.perf_counter() - start)
+        return json_data
+
+
+class _CachedResponse:
+    """
+    A response served from the response cache in place of an HTTP 304 response. It offers the parts of the
+    ``aiohttp.ClientResponse`` interface that are used to read the body.
+    """
+
+    def __init__(self, entry: CacheEntry, response: aiohttp.ClientResponse):
+        self.__entry = entry
+        self.status = 200
+        self.url = response.url
+        self.headers = response.headers
+        self.content_type = entry.content_type
+
+    async def read(self) -> bytes:
+        return self.__entry.body
+
+    async def text(self, encoding: str = None) -> str:
+        return self.__entry.body.decode(encoding or 'utf-8')
+
+    async def json(self, *, encoding: str = None, loads=json.loads, content_type: str = 'application/json'):
+        if content_type is not None and content_type not in self.content_type:
+            raise aiohttp.ContentTypeError(None, (), message=f'Attempt to decode JSON with unexpected mimetype: {self.content_type}')
+
+        return loads(await self.text(encoding))
+
+    def release(self) -> None:
+        pass
+
+
+_JSON_CONTENT_TYPE = re.compile(r'^application/(?:[\w.+-]+?\+)?json')
+
+
+def _is_expected_content_type(response_content_type: str, expected_content_type: str) -> bool:
+    """
+    Checks the content type of a response like ``aiohttp.ClientResponse.json()`` does.
+    """
+    if expected_content_type == 'application/json':
+        return _JSON_CONTENT_TYPE.match(response_content_type or '') is not None
+
+    return expected_content_type in (response_content_type or '')
+
+
+def _parse_retry_after(value: str) -> float:
+    """
+    Parses the value of a ``Retry-After`` header, which is either a number of seconds or an HTTP date.
+
+    Args:
+        value: The header value.
+
+    Returns:
+        The number of seconds to wait or ``None`` if the value is not set or invalid.
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,62 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# The live stats of a player that are tracked by default.
+LIVE_FIELDS = ['minutes', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded', 'own_goals', 'penalties_saved',
+               'penalties_missed', 'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps', 'total_points']
+
+
+class LiveState:
+    """
+    This class holds the current live stats of the players of a game week and computes which of them have changed when
+    a new response of the ``event/{id}/live`` endpoint is applied. The stats are kept in ``df``, a data frame indexed by
+    ``player_id`` that is updated in place, so that it can be shared with code that reads it between polls. Only when
+    players are added to the game week, ``df`` is replaced by a new data frame. The stats are stored as floats so that
+    stats missing from the response can be represented.
+    """
+
+    def __init__(self, fields: List[str] = None):
+        """
+        Create a new instance of this class.
+
+        Args:
+            fields: (optional) The live stats to track. If not set, ``LIVE_FIELDS`` are tracked.
+        """
+        self.fields = LIVE_FIELDS if fields is None else fields
+        self.df = pd.DataFrame(columns=['player_id'] + self.fields).set_index('player_id')
+
+    def update(self, elements: List[dict]) -> pd.DataFrame:
+        """
+        Applies the given live stats and returns the ones that have changed.
+
+        Args:
+            elements: The ``elements`` of the response of the ``event/{id}/live`` endpoint.
+
+        Returns:
+            The players whose tracked stats have changed or who were not known before with their new stats as a pandas
+            data frame indexed by ``player_id``.
+        """
+        player_ids = np.fromiter((element['id'] for element in elements), dtype=np.int64, count=len(elements))
+        values = np.array([[element['stats'].get(field, np.nan) for field in self.fields] for element in elements],
+                          dtype=np.float64).reshape(len(elements), len(self.fields))
+
+        known = self.df.index.get_indexer(player_ids)
+        is_new = known < 0
+        previous = self.df.to_numpy(dtype=np.float64)[known[~is_new]]
+        current = values[~is_new]
+        is_changed = np.zeros(len(elements), dtype=bool)
+        is_changed[~is_new] = ((previous != current) & ~(np.isnan(previous) & np.isnan(current))).any(axis=1)
+
+        if is_changed.any():
+            self.df.iloc[known[is_changed]] = values[is_changed]
+
+        if is_new.any():
+            new_df = pd.DataFrame(values[is_new], index=pd.Index(player_ids[is_new], name='player_id'),
+                                  columns=self.fields)
+            self.df = pd.concat([self.df, new_df]).astype(np.float64) if len(self.df) > 0 else new_df
+
+        is_delta = is_changed | is_new
+        return pd.DataFrame(values[is_delta], index=pd.Index(player_ids[is_delta], name='player_id'),
+                            columns=self.fields)
@@ -0,0 +1,246 @@
+import functools
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+class Instrumentation:
+    """
+    This class is the interface for collecting metrics of an ``FPLPandas`` instance. All hooks do nothing; subclasses
+    override the ones they need. Hooks are called on the event loop of the instance and must not block.
+    """
+
+    def on_request(self, endpoint: str, status: int, bytes_received: int, duration: float) -> None:
+        """
+        Called when the response of a GET request has been received.
+
+        Args:
+            endpoint: The name of the endpoint in ``fpl.constants.API_URLS`` or ``other``.
+            status: The HTTP status of the response. Responses served from the HTTP cache are reported with 304.
+            bytes_received: The size of the response body in bytes.
+            duration: The number of seconds from sending the request to receiving the whole body.
+        """
+
+    def on_wait(self, reason: str, duration: float) -> None:
+        """
+        Called when a request has been delayed.
+
+        Args:
+            reason: ``rate_limit`` for waiting for the rate limiter, including pauses after HTTP 429.
+            duration: The number of seconds waited.
+        """
+
+    def on_retry(self, endpoint: str, reason: str) -> None:
+        """
+        Called when a request is repeated.
+
+        Args:
+            endpoint: The name of the endpoint in ``fpl.constants.API_URLS`` or ``other``.
+            reason: ``throttled`` for requests rejected with HTTP 429.
+        """
+
+    def on_login(self, duration: float) -> None:
+        """
+        Called when a login has completed.
+
+        Args:
+            duration: The number of seconds the login took.
+        """
+
+    def on_decode(self, endpoint: str, duration: float) -> None:
+        """
+        Called when the JSON body of a response has been decoded.
+
+        Args:
+            endpoint: The name of the endpoint in ``fpl.constants.API_URLS`` or ``other``.
+            duration: The number of seconds the decoding took.
+        """
+
+    def on_conversion(self, method: str, duration: float) -> None:
+        """
+        Called when the JSON returned by the API has been converted to data frames.
+
+        Args:
+            method: The name of the ``FPLPandas`` method, e.g. ``get_players``.
+            duration: The number of seconds the conversion took.
+        """
+
+
+class MetricsCollector(Instrumentation):
+    """
+    This class collects the metrics reported to ``Instrumentation`` in memory. Counters are kept as totals and durations
+    as summaries of their count and sum. The metrics can be read with ``get_counter()`` and ``get_summary()`` or
+    exported in the Prometheus text format with ``to_prometheus()``. All methods are thread-safe.
+    """
+
+    # The descriptions of the metrics keyed by name.
+    METRICS = {
+        'requests_total': ('counter', 'The number of GET requests by endpoint and HTTP status.'),
+        'received_bytes_total': ('counter', 'The number of bytes received by endpoint.'),
+        'retries_total': ('counter', 'The number of repeated requests by endpoint and reason.'),
+        'request_duration_seconds': ('summary', 'The time from sending a request to receiving its body by endpoint.'),
+        'wait_duration_seconds': ('summary', 'The time requests were delayed by reason.'),
+        'login_duration_seconds': ('summary', 'The time logins took.'),
+        'decode_duration_seconds': ('summary', 'The time decoding JSON took by endpoint.'),
+        'conversion_duration_seconds': ('summary', 'The time converting JSON to data frames took by method.'),
+    }
+
+    def __init__(self):
+        """
+        Create a new instance of this class.
+        """
+        self.__lock = threading.Lock()
+        self.__counters = defaultdict(float)
+        self.__summaries = defaultdict(lambda: [0, 0.0])
+
+    def on_request(self, endpoint: str, status: int, bytes_received: int, duration: float) -> None:
+        with self.__lock:
+            self.__counters['requests_total', (('endpoint', endpoint), ('status', str(status)))] += 1
+            self.__counters['received_bytes_total', (('endpoint', endpoint),)] += bytes_received
+            self.__observe('request_duration_seconds', (('endpoint', endpoint),), duration)
+
+    def on_wait(self, reason: str, duration: float) -> None:
+        with self.__lock:
+            self.__observe('wait_duration_seconds', (('reason', reason),), duration)
+
+    def on_retry(self, endpoint: str, reason: str) -> None:
+        with self.__lock:
+            self.__counters['retries_total', (('endpoint', endpoint), ('reason', reason))] += 1
+
+    def on_login(self, duration: float) -> None:
+        with self.__lock:
+            self.__observe('login_duration_seconds', (), duration)
+
+    def on_decode(self, endpoint: str, duration: float) -> None:
+        with self.__lock:
+            self.__observe('decode_duration_seconds', (('endpoint', endpoint),), duration)
+
+    def on_conversion(self, method: str, duration: float) -> None:
+        with self.__lock:
+            self.__observe('conversion_duration_seconds', (('method', method),), duration)
+
+    def __observe(self, name: str, labels: tuple, value: float) -> None:
+        summary = self.__summaries[name, labels]
+        summary[0] += 1
+        summary[1] += value
+
+    def get_counter(self, name: str, **labels) -> float:
+        """
+        Returns the total of the given counter across all label values that are not given.
+
+        Args:
+            name: The name of the counter, e.g. ``requests_total``.
+            **labels: The label values to filter by, e.g. ``endpoint='player'``.
+
+        Returns:
+            The total.
+        """
+        with self.__lock:
+            return sum(value for (metric, metric_labels), value in self.__counters.items()
+                       if metric == name and _matches(metric_labels, labels))
+
+    def get_summary(self, name: str, **labels) -> Tuple[int, float]:
+        """
+        Returns the number and the sum of the observations of the given summary across all label values that are not
+        given.
+
+        Args:
+            name: The name of the summary, e.g. ``conversion_duration_seconds``.
+            **labels: The label values to filter by, e.g. ``method='get_players'``.
+
+        Returns:
+            1: The number of observations.
+            2: The sum of the observations.
+        """
+        with self.__lock:
+            summaries = [summary for (metric, metric_labels), summary in self.__summaries.items()
+                         if metric == name and _matches(metric_labels, labels)]
+            return sum(count for count, _ in summaries), sum(total for _, total in summaries)
+
+    def reset(self) -> None:
+        """
+        Discards all collected metrics.
+        """
+        with self.__lock:
+            self.__counters.clear()
+            self.__summaries.clear()
+
+    def to_prometheus(self, prefix: str = 'fplpandas') -> str:
+        """
+        Returns the collected metrics in the Prometheus text exposition format, e.g. to be served by a ``/metrics``
+        endpoint.
+
+        Args:
+            prefix: The prefix of the metric names.
+
+        Returns:
+            The metrics as text.
+        """
+        with self.__lock:
+            lines = []
+            for name, (metric_type, description) in self.METRICS.items():
+                full_name = f'{prefix}_{name}'
+                lines.append(f'# HELP {full_name} {description}')
+                lines.append(f'# TYPE {full_name} {metric_type}')
+                if metric_type == 'counter':
+                    lines.extend(f'{full_name}{_format_labels(labels)} {_format_value(value)}'
+                                 for (metric, labels), value in sorted(self.__counters.items()) if metric == name)
+                else:
+                    for (metric, labels), (count, total) in sorted(self.__summaries.items()):
+                        if metric == name:
+                            lines.append(f'{full_name}_sum{_format_labels(labels)} {_format_value(total)}')
+                            lines.append(f'{full_name}_count{_format_labels(labels)} {count}')
+
+            return '\n'.join(lines) + '\n'
+
+
+def get_endpoint(url) -> str:
+    """
+    Returns the name of the FPL API endpoint of the given URL.
+
+    Args:
+        url: The URL of the request.
+
+    Returns:
+        The name of the endpoint in ``fpl.constants.API_URLS`` or ``other`` if the URL does not belong to any.
+    """
+    from yarl import URL
+
+    path_qs = URL(str(url)).path_qs
+    for name, pattern in _get_endpoint_patterns():
+        if pattern.match(path_qs):
+            return name
+
+    return 'other'
+
+
+@functools.lru_cache(maxsize=None)
+def _get_endpoint_patterns() -> List[Tuple[str, re.Pattern]]:
+    """
+    Returns the patterns of the paths of the FPL API endpoints keyed by their names in ``fpl.constants.API_URLS``.
+    Requests are reported by endpoint rather than by URL so that, e.g., the summaries of all players are counted
+    together. The FPL package is only imported when the first request is reported.
+    """
+    from fpl.constants import API_URLS
+    from yarl import URL
+
+    return [(name, re.compile('^' + re.escape(URL(url.replace('{}', 'ID')).path_qs).replace('ID', '[^/?&]+') + '$'))
+            for name, url in API_URLS.items()]
+
+
+def _matches(metric_labels: tuple, labels: Dict[str, object]) -> bool:
+    metric_labels = dict(metric_labels)
+    return all(metric_labels.get(name) == str(value) for name, value in labels.items())
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if len(labels) == 0:
+        return ''
+
+    escaped = [(name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in labels]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import os
+import random
+from urllib.parse import quote
+
+from aiohttp import web
+from yarl import URL
+
+# The hosts of the FPL API and of its login, whose requests are sent to a stand-in server instead.
+API_HOST = 'fantasy.premierleague.com'
+LOGIN_HOST = 'users.premierleague.com'
+
+# The path under which requests for the login host are served by a stand-in server.
+LOGIN_PATH = '/users'
+
+
+class ResponseRecorder:
+    """
+    This class captures API responses to a directory so that they can be served again by ``ReplayServer``. Each
+    response is stored in its own file named after the path and query of its URL. A response recorded again replaces
+    the previous one.
+    """
+
+    def __init__(self, path: str):
+        """
+        Create a new instance of this class.
+
+        Args:
+            path: The directory in which responses are stored. It is created if it does not exist.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def record(self, url: str, body: bytes) -> None:
+        """
+        Stores the given response body for the given URL.
+
+        Args:
+            url: The URL of the response.
+            body: The response body.
+        """
+        file_path = os.path.join(self.path, get_file_name(str(URL(url).path_qs)))
+        with open(file_path + '.tmp', 'wb') as file:
+            file.write(body)
+        os.replace(file_path + '.tmp', file_path)
+
+    def get(self, path_qs: str) -> bytes:
+        """
+        Returns the recorded response body for the given path and query.
+
+        Args:
+            path_qs: The path and query of the URL, e.g. ``/api/fixtures/?event=1``.
+
+        Returns:
+            The response body or ``None`` if none has been recorded.
+        """
+        try:
+            with open(os.path.join(self.path, get_file_name(path_qs)), 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+
+class ReplayServer:
+    """
+    This class is a local stand-in for the FPL API that serves the responses captured by ``ResponseRecorder`` at the
+    paths of ``fpl.constants.API_URLS``. It can add latency to every response and reject requests with HTTP 429 to
+    reproduce the load patterns of the live API offline. Requests for URLs that have not been recorded are answered
+    with HTTP 404 like the API does. Logins always succeed.
+
+    Pass ``base_url`` to ``FPLPandas`` or ``AsyncFPLPandas`` to send their requests to the server.
+    """
+
+    def __init__(self, path: str, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 1.0, seed: int = None):
+        """
+        Create a new instance of this class.
+
+        Args:
+            path: The directory with the recorded responses.
+            host: The host name the server listens on.
+            port: The port the server listens on. If 0, a free port is chosen when the server is started.
+            latency: The number of seconds each response is delayed.
+            jitter: The maximum number of seconds that is randomly added to the latency.
+            throttle_rate: The fraction of requests that are rejected with HTTP 429.
+            retry_after: The number of seconds sent in the ``Retry-After`` header of rejected requests.
+            seed: (optional) The seed for the random latency and rejections.
+        """
+        self.recorder = ResponseRecorder(path)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self.__random = random.Random(seed)
+        self.__runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        """
+        The URL of the started server.
+        """
+        return f'http://{self.host}:{self.port}'
+
+    def create_app(self) -> web.Application:
+        """
+        Returns the aiohttp application that serves the recorded responses.
+
+        Returns:
+            The application.
+        """
+        app = web.Application()
+        app.router.add_post(LOGIN_PATH + '/accounts/login/', self.__handle_login)
+        app.router.add_get('/a/login', self.__handle_login_redirect)
+        app.router.add_get('/{tail:.*}', self.__handle_get)
+        return app
+
+    async def start(self) -> None:
+        """
+        Starts the server in the running event loop.
+        """
+        self.__runner = web.AppRunner(self.create_app())
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, self.host, self.port)
+        await site.start()
+        self.port = self.__runner.addresses[0][1]
+
+    async def close(self) -> None:
+        """
+        Stops the server. Calling this method more than once has no effect.
+        """
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    async def __delay(self) -> None:
+        delay = self.latency + self.__random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __handle_get(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await self.__delay()
+
+        if self.__random.random() < self.throttle_rate:
+            self.throttled += 1
+            return web.json_response({'detail': 'Request was throttled.'}, status=429,
+                                     headers={'Retry-After': str(self.retry_after)})
+
+        body = self.recorder.get(request.path_qs)
+        if body is None:
+            return web.json_response({'detail': 'Not found.'}, status=404)
+
+        return web.Response(body=body, content_type='application/json')
+
+    async def __handle_login(self, request: web.Request) -> web.Response:
+        await self.__delay()
+        raise web.HTTPFound('/a/login?state=success')
+
+    async def __handle_login_redirect(self, request: web.Request) -> web.Response:
+        response = web.Response(text='')
+        response.set_cookie('csrftoken', 'replay')
+        response.set_cookie('pl_profile', 'replay')
+        return response
+
+
+def get_file_name(path_qs: str) -> str:
+    """
+    Returns the name of the file in which the response for the given path and query is recorded.
+
+    Args:
+        path_qs: The path and query of the URL, e.g. ``/api/fixtures/?event=1``.
+
+    Returns:
+        The file name.
+    """
+    return quote(path_qs.lstrip('/'), safe='') + '.json'
+
+
+def rewrite_url(url, base_url: str) -> str:
+    """
+    Returns the given URL with the FPL API or login host replaced by the given stand-in server. Other URLs are returned
+    unchanged.
+
+    Args:
+        url: The URL to rewrite.
+        base_url: The URL of the stand-in server, e.g. ``http://127.0.0.1:8080``.
+
+    Returns:
+        The rewritten URL.
+    """
+    url = URL(str(url))
+    if url.host == API_HOST:
+        return str(URL(base_url).with_path(url.path).with_query(url.query_string))
+    if url.host == LOGIN_HOST:
+        return str(URL(base_url).with_path(LOGIN_PATH + url.path).with_query(url.query_string))
+
+    return str(url)
+
+
+def main(args=None) -> None:
+    """
+    Runs a ``ReplayServer`` until it is interrupted, e.g.:
+
+        python -m fplpandas.replay recordings --port 8080 --latency 0.05 --throttle-rate 0.01
+    """
+    parser = argparse.ArgumentParser(description='Serves recorded FPL API responses.')
+    parser.add_argument('path', help='The directory with the recorded responses.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--seed', type=int)
+    options = parser.parse_args(args)
+
+    server = ReplayServer(options.path, options.host, options.port, options.latency, options.jitter,
+                          options.throttle_rate, options.retry_after, options.seed)
+    web.run_app(server.create_app(), host=options.host, port=options.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+INT8 = 'Int8'
+INT16 = 'Int16'
+INT32 = 'Int32'
+INT64 = 'Int64'
+FLOAT = 'float'
+BOOL = 'bool'
+CATEGORY = 'category'
+DATETIME = 'datetime'
+
+_EXPECTED_STATS = {'expected_goals': FLOAT, 'expected_assists': FLOAT, 'expected_goal_involvements': FLOAT,
+                   'expected_goals_conceded': FLOAT}
+
+_ICT_STATS = {'influence': FLOAT, 'creativity': FLOAT, 'threat': FLOAT, 'ict_index': FLOAT}
+
+# The stats are per game in the history and per season in the players and the past seasons, so they are wide enough
+# for the totals of a season, e.g. 3420 minutes.
+_PLAYER_STATS = {'minutes': INT16, 'goals_scored': INT16, 'assists': INT16, 'clean_sheets': INT16,
+                 'goals_conceded': INT16, 'own_goals': INT16, 'penalties_saved': INT16, 'penalties_missed': INT16,
+                 'yellow_cards': INT16, 'red_cards': INT16, 'saves': INT16, 'bonus': INT16, 'bps': INT16,
+                 'starts': INT16, 'total_points': INT16, **_ICT_STATS, **_EXPECTED_STATS}
+
+# The schemas of the data frames returned by the getters keyed by the names also used for snapshots. Each integer column
+# has a fixed width that holds all values the API returns for it, so that the data types are the same for every call.
+# The string-encoded numbers of the API, e.g. ``form`` and ``ict_index``, are parsed as floats.
+SCHEMAS = {
+    'teams': {'code': INT16, 'draw': INT8, 'form': FLOAT, 'loss': INT8, 'name': CATEGORY, 'played': INT8,
+              'points': INT16, 'position': INT8, 'short_name': CATEGORY, 'strength': INT8, 'unavailable': BOOL,
+              'win': INT8, 'strength_overall_home': INT16, 'strength_overall_away': INT16,
+              'strength_attack_home': INT16, 'strength_attack_away': INT16, 'strength_defence_home': INT16,
+              'strength_defence_away': INT16, 'pulse_id': INT16},
+    'game_weeks': {'name': CATEGORY, 'deadline_time': DATETIME, 'average_entry_score': INT16, 'finished': BOOL,
+                   'data_checked': BOOL, 'highest_scoring_entry': INT32, 'deadline_time_epoch': INT64,
+                   'deadline_time_game_offset': INT32, 'highest_score': INT16, 'is_previous': BOOL,
+                   'is_current': BOOL, 'is_next': BOOL, 'cup_leagues_created': BOOL, 'h2h_ko_matches_created': BOOL,
+                   'most_selected': INT16, 'most_transferred_in': INT16, 'top_element': INT16,
+                   'transfers_made': INT32, 'most_captained': INT16, 'most_vice_captained': INT16},
+    'fixtures': {'code': INT32, 'event': INT8, 'finished': BOOL, 'finished_provisional': BOOL,
+                 'kickoff_time': DATETIME, 'minutes': INT8, 'provisional_start_time': BOOL, 'started': BOOL,
+                 'team_a': INT8, 'team_a_score': INT8, 'team_h': INT8, 'team_h_score': INT8,
+                 'team_h_difficulty': INT8, 'team_a_difficulty': INT8, 'pulse_id': INT32},
+    'players': {'chance_of_playing_next_round': INT8, 'chance_of_playing_this_round': INT8, 'code': INT32,
+                'cost_change_event': INT8, 'cost_change_event_fall': INT8, 'cost_change_start': INT8,
+                'cost_change_start_fall': INT8, 'dreamteam_count': INT8, 'element_type': INT8, 'ep_next': FLOAT,
+                'ep_this': FLOAT, 'event_points': INT8, 'form': FLOAT, 'in_dreamteam': BOOL, 'news': CATEGORY,
+                'news_added': DATETIME, 'now_cost': INT16, 'points_per_game': FLOAT, 'selected_by_percent': FLOAT,
+                'special': BOOL, 'squad_number': INT8, 'status': CATEGORY, 'team': INT8, 'team_code': INT16,
+                'transfers_in': INT32, 'transfers_in_event': INT32, 'transfers_out': INT32,
+                'transfers_out_event': INT32, 'value_form': FLOAT, 'value_season': FLOAT, 'influence_rank': INT16,
+                'influence_rank_type': INT16, 'creativity_rank': INT16, 'creativity_rank_type': INT16,
+                'threat_rank': INT16, 'threat_rank_type': INT16, 'ict_index_rank': INT16,
+                'ict_index_rank_type': INT16, 'region': INT16, **_PLAYER_STATS},
+    'players_history_past': {'element_code': INT32, 'start_cost': INT16, 'end_cost': INT16, **_PLAYER_STATS},
+    'players_history': {'element': INT16, 'opponent_team': INT8, 'was_home': BOOL, 'kickoff_time': DATETIME,
+                        'team_h_score': INT8, 'team_a_score': INT8, 'round': INT8, 'value': INT16,
+                        'transfers_balance': INT32, 'selected': INT32, 'transfers_in': INT32, 'transfers_out': INT32,
+                        **_PLAYER_STATS},
+    'players_fixtures': {'id': INT16, 'code': INT32, 'team_h': INT8, 'team_h_score': INT8, 'team_a': INT8,
+                         'team_a_score': INT8, 'finished': BOOL, 'minutes': INT8, 'provisional_start_time': BOOL,
+                         'kickoff_time': DATETIME, 'event_name': CATEGORY, 'is_home': BOOL, 'difficulty': INT8},
+    'user_team_picks': {'position': INT8, 'selling_price': INT16, 'multiplier': INT8, 'purchase_price': INT16,
+                        'is_captain': BOOL, 'is_vice_captain': BOOL},
+}
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    Converts the columns of the given data frame to compact data types according to the given schema. Columns that are
+    not in the schema or not in the data frame are left as they are. Integer columns are converted to the nullable
+    integer type of the schema whatever their values, so that the data type of a column is the same for every call.
+
+    Args:
+        df: The data frame to convert.
+        schema: The kind of each column: ``Int8``, ``Int16``, ``Int32``, ``Int64``, ``float``, ``bool``, ``category``
+        or ``datetime``.
+
+    Returns:
+        A new data frame with the converted columns.
+    Raises:
+        ValueError: An integer column has a value that does not fit into the type of the schema
+    """
+    converted = {column: _convert(df[column], kind) for column, kind in schema.items() if column in df.columns}
+    return df.assign(**converted) if len(converted) > 0 else df.copy()
+
+
+def _convert(series: pd.Series, kind: str) -> pd.Series:
+    if kind == CATEGORY:
+        return series.astype('category')
+
+    if kind == DATETIME:
+        return pd.to_datetime(series, utc=True, errors='coerce')
+
+    if kind == BOOL:
+        try:
+            return series.astype('boolean')
+        except (TypeError, ValueError):
+            return series
+
+    numbers = pd.to_numeric(series, errors='coerce')
+    if kind == FLOAT:
+        return numbers.astype('float32')
+
+    values = numbers.dropna()
+    if len(values) > 0 and not np.array_equal(values, np.floor(values)):
+        return numbers.astype('float32')
+
+    info = np.iinfo(kind.lower())
+    if len(values) > 0 and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"The column '{series.name}' has values outside of the range of {kind}.")
+
+    return numbers.astype(kind)
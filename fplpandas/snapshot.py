@@ -0,0 +1,152 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import pandas as pd
+
+FORMAT_VERSION = 1
+FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+MANIFEST_FILE = 'manifest.json'
+LATEST_FILE = 'LATEST'
+
+
+def save_snapshot(frames: Dict[str, pd.DataFrame], path: str, file_format: str = 'arrow') -> str:
+    """
+    Saves the given data frames including their indexes as a new version of the snapshot in the given directory. Each
+    version is written to its own sub-directory and only becomes the latest version once all its frames are written.
+
+    Args:
+        frames: The data frames to save keyed by name, e.g. ``teams``.
+        path: The directory of the snapshot. It is created if it does not exist.
+        file_format: ``arrow`` for uncompressed Arrow IPC files that can be memory-mapped or ``parquet`` for smaller
+        Parquet files.
+
+    Returns:
+        The version of the saved snapshot.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown snapshot format {file_format}. Supported formats are: {', '.join(FORMATS)}.")
+
+    pa = _import_pyarrow()
+    created = datetime.now(timezone.utc)
+    version = created.strftime('%Y%m%dT%H%M%S%fZ')
+    version_path = os.path.join(path, version)
+    os.makedirs(version_path)
+
+    for name, df in frames.items():
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        file_path = os.path.join(version_path, name + FORMATS[file_format])
+        if file_format == 'arrow':
+            with pa.OSFile(file_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            import pyarrow.parquet as pq
+            pq.write_table(table, file_path)
+
+    manifest = {'format_version': FORMAT_VERSION, 'version': version, 'created': created.isoformat(),
+                'file_format': file_format, 'frames': list(frames)}
+    with open(os.path.join(version_path, MANIFEST_FILE), 'w') as file:
+        json.dump(manifest, file)
+
+    latest_path = os.path.join(path, LATEST_FILE)
+    with open(latest_path + '.tmp', 'w') as file:
+        file.write(version)
+    os.replace(latest_path + '.tmp', latest_path)
+
+    return version
+
+
+def load_snapshot(path: str, version: str = None, names: List[str] = None, memory_map: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Loads the data frames of a snapshot saved with ``save_snapshot()``. This function does not require network access.
+
+    Args:
+        path: The directory of the snapshot.
+        version: (optional) The version to load. If not set, the latest version is loaded.
+        names: (optional) The names of the data frames to load. If not set, all data frames are loaded.
+        memory_map: Whether Arrow IPC files are memory-mapped instead of being read into memory first.
+
+    Returns:
+        The data frames keyed by name with the same indexes as the saved ones.
+    """
+    pa = _import_pyarrow()
+    manifest = get_manifest(path, version)
+    version_path = os.path.join(path, manifest['version'])
+    file_format = manifest['file_format']
+
+    frames = {}
+    for name in manifest['frames'] if names is None else names:
+        if name not in manifest['frames']:
+            raise ValueError(f"Data frame {name} not found in snapshot version {manifest['version']}.")
+
+        file_path = os.path.join(version_path, name + FORMATS[file_format])
+        if file_format == 'arrow':
+            source = pa.memory_map(file_path, 'r') if memory_map else pa.OSFile(file_path, 'rb')
+            with source:
+                table = pa.ipc.open_file(source).read_all()
+        else:
+            import pyarrow.parquet as pq
+            table = pq.read_table(file_path, memory_map=memory_map)
+
+        frames[name] = table.to_pandas(split_blocks=True)
+
+    return frames
+
+
+def list_snapshots(path: str) -> List[str]:
+    """
+    Returns the versions of the snapshot in the given directory.
+
+    Args:
+        path: The directory of the snapshot.
+
+    Returns:
+        The versions ordered from the oldest to the latest one.
+    """
+    if not os.path.isdir(path):
+        return []
+
+    return sorted(name for name in os.listdir(path) if os.path.isfile(os.path.join(path, name, MANIFEST_FILE)))
+
+
+def get_manifest(path: str, version: str = None) -> dict:
+    """
+    Returns the manifest of a snapshot version, which describes when it was created and which data frames it contains.
+
+    Args:
+        path: The directory of the snapshot.
+        version: (optional) The version. If not set, the manifest of the latest version is returned.
+
+    Returns:
+        The manifest.
+    Raises:
+        ValueError: No snapshot found
+    """
+    if version is None:
+        try:
+            with open(os.path.join(path, LATEST_FILE)) as file:
+                version = file.read().strip()
+        except FileNotFoundError:
+            raise ValueError(f"No snapshot found in {path}.")
+
+    try:
+        with open(os.path.join(path, version, MANIFEST_FILE)) as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        raise ValueError(f"Snapshot version {version} not found in {path}.")
+
+    if manifest['format_version'] > FORMAT_VERSION:
+        raise ValueError(f"Snapshot version {version} has format version {manifest['format_version']}, which is not supported by this version of the package.")
+
+    return manifest
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise ImportError("Snapshots require the pyarrow package. Please install it, e.g. with pip install pandas-fpl[snapshot].")
+
+    return pyarrow
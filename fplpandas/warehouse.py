@@ -0,0 +1,273 @@
+import os
+import threading
+import time
+from typing import List, Tuple
+
+import pandas as pd
+
+from .snapshot import _import_pyarrow
+
+# The columns that identify a record of the history of a season.
+KEY = ['player_id', 'fixture']
+
+# The columns a history data frame must have to be stored.
+REQUIRED_COLUMNS = KEY + ['round', 'kickoff_time']
+
+# The column that marks a record as moved to another game week.
+DELETED = '_deleted'
+
+
+class HistoryWarehouse:
+    """
+    This class is an append-only local store of the completed games of the players across seasons, as returned by
+    ``get_players()`` in the third data frame. Records are stored as Parquet files partitioned by season and game week.
+    Each append only writes the records that are new or have changed since the previous append, e.g. because bonus
+    points were added, so that every ``(player_id, fixture)`` of a season is returned once in its latest version.
+    Queries prune the partitions by season and game week and filter the rows by player and team without any network
+    access.
+
+    Pass an instance as ``warehouse`` to ``FPLPandas`` to update the store whenever the players are downloaded.
+    """
+
+    def __init__(self, path: str):
+        """
+        Create a new instance of this class. Records stored by a previous instance in the same directory are reused.
+
+        Args:
+            path: The directory of the store. It is created if it does not exist.
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__last_part = 0
+        os.makedirs(path, exist_ok=True)
+
+    def append(self, history_df: pd.DataFrame, players_df: pd.DataFrame = None) -> int:
+        """
+        Stores the new and changed records of the given history. The season of each record is derived from its
+        ``kickoff_time``.
+
+        Args:
+            history_df: The completed games indexed by ``player_id``, ``fixture`` as returned by ``get_players()``.
+            players_df: (optional) The players indexed by ``player_id`` as returned by ``get_players()``. If set, the
+            ``team`` and the ``code`` of each player, which is the same in all seasons, are stored with the records as
+            ``team`` and ``element_code``.
+
+        Returns:
+            The number of stored records.
+        Raises:
+            ValueError: The history lacks a required column
+        """
+        df = history_df.reset_index()
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        if len(missing) > 0:
+            raise ValueError(f"The history cannot be stored because it lacks the columns: {', '.join(missing)}.")
+
+        if players_df is not None:
+            for column, players_column in [('team', 'team'), ('element_code', 'code')]:
+                if column not in df.columns and players_column in players_df.columns:
+                    df[column] = df['player_id'].map(players_df[players_column])
+
+        df['season'] = _get_seasons(df['kickoff_time'])
+        df[DELETED] = False
+
+        pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        stored = 0
+        with self.__lock:
+            for season, season_df in df.groupby('season', sort=True):
+                latest_df = self.__read(season, None, None, None)
+                changed_df = _get_changed(season_df.drop_duplicates(KEY, keep='last'), latest_df)
+                if len(changed_df) == 0:
+                    continue
+
+                # Records whose fixture has moved to another game week are marked as deleted in the previous one.
+                previous_df = latest_df[KEY + ['round']].rename(columns={'round': 'previous_round'})
+                moved_df = changed_df.merge(previous_df, on=KEY)
+                moved_df = moved_df[moved_df['previous_round'] != moved_df['round']]
+                if len(moved_df) > 0:
+                    moved_df = (moved_df.assign(round=moved_df['previous_round'], **{DELETED: True})
+                                .drop(columns=['previous_round']))
+                    self.__write(pa, pq, season, moved_df)
+
+                self.__write(pa, pq, season, changed_df)
+                stored += len(changed_df)
+
+        return stored
+
+    def query(self, seasons: List[str] = None, events: Tuple[int, int] = None, player_ids: List[int] = None,
+              team_ids: List[int] = None, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Returns the stored records that match all given filters.
+
+        Args:
+            seasons: (optional) The seasons, e.g. ``['2019/20', '2020/21']``. If not set, all seasons are returned.
+            events: (optional) The first and the last game week, e.g. ``(1, 10)``. If not set, all game weeks are returned.
+            player_ids: (optional) The IDs of the players in their season. Use ``element_code`` to follow a player
+            across seasons.
+            team_ids: (optional) The IDs of the teams. Only records stored with ``players_df`` have a team.
+            columns: (optional) The columns to return besides the index. If not set, all columns are returned.
+
+        Returns:
+            The records as a pandas data frame indexed by ``season``, ``player_id``, ``fixture``.
+        """
+        if seasons is None:
+            seasons = self.list_seasons()
+
+        with self.__lock:
+            frames = [self.__read(season, events, player_ids, team_ids) for season in seasons]
+
+        frames = [df for df in frames if len(df) > 0]
+        if len(frames) == 0:
+            return pd.DataFrame(columns=['season'] + KEY + (columns or [])).set_index(['season'] + KEY)
+
+        df = pd.concat(frames, ignore_index=True).set_index(['season'] + KEY).sort_index()
+        if columns is not None:
+            df = df.reindex(columns=columns)
+
+        return df
+
+    def compact(self, seasons: List[str] = None) -> int:
+        """
+        Rewrites each game week partition of the given seasons to a single file that only holds the latest version of
+        its records. Every append that changes records adds files to the partitions, which are all read by the next
+        append and by queries, so compacting from time to time keeps both fast.
+
+        Args:
+            seasons: (optional) The seasons, e.g. ``['2019/20', '2020/21']``. If not set, all seasons are compacted.
+
+        Returns:
+            The number of removed files.
+        """
+        pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        removed = 0
+        with self.__lock:
+            for season in seasons or self.list_seasons():
+                files = self.__list_files(season, None)
+                events = {os.path.dirname(file_path) for _, file_path in files}
+                if len(files) == len(events):
+                    continue
+
+                # The new files sort after the old ones, so the records stay the same if not all old ones are removed.
+                df = self.__read(season, None, None, None)
+                self.__write(pa, pq, season, df.assign(**{DELETED: False}))
+
+                for _, file_path in files:
+                    os.remove(file_path)
+                    removed += 1
+
+                for event_path in events:
+                    if len(os.listdir(event_path)) == 0:
+                        os.rmdir(event_path)
+
+        return removed
+
+    def list_seasons(self) -> List[str]:
+        """
+        Returns the seasons of the stored records.
+
+        Returns:
+            The seasons ordered from the oldest to the latest one, e.g. ``['2019/20', '2020/21']``.
+        """
+        return sorted(_get_value(name).replace('-', '/') for name in os.listdir(self.path) if name.startswith('season='))
+
+    def list_events(self, season: str) -> List[int]:
+        """
+        Returns the game weeks of the stored records of the given season.
+
+        Args:
+            season: The season, e.g. ``2020/21``.
+
+        Returns:
+            The game weeks in ascending order.
+        """
+        season_path = self.__get_season_path(season)
+        if not os.path.isdir(season_path):
+            return []
+
+        return sorted(int(_get_value(name)) for name in os.listdir(season_path) if name.startswith('event='))
+
+    def __get_season_path(self, season: str) -> str:
+        return os.path.join(self.path, 'season=' + season.replace('/', '-'))
+
+    def __write(self, pa, pq, season: str, df: pd.DataFrame) -> None:
+        """
+        Writes the given records of the given season to a new file in the partition of their game week.
+        """
+        for event, event_df in df.groupby('round', sort=True):
+            event_path = os.path.join(self.__get_season_path(season), f'event={int(event):02d}')
+            os.makedirs(event_path, exist_ok=True)
+            # The names of the files order the records by the time they were written.
+            self.__last_part = max(time.time_ns(), self.__last_part + 1)
+            file_path = os.path.join(event_path, f'part-{self.__last_part:020d}.parquet')
+            pq.write_table(pa.Table.from_pandas(event_df, preserve_index=False), file_path + '.tmp')
+            os.replace(file_path + '.tmp', file_path)
+
+    def __list_files(self, season: str, events: Tuple[int, int]) -> List[Tuple[str, str]]:
+        """
+        Lists the names and the paths of the files of the given season in the partitions of the given game weeks.
+        """
+        files = []
+        for event in self.list_events(season):
+            if events is None or events[0] <= event <= events[1]:
+                event_path = os.path.join(self.__get_season_path(season), f'event={event:02d}')
+                files.extend((name, os.path.join(event_path, name))
+                             for name in os.listdir(event_path) if name.endswith('.parquet'))
+
+        return files
+
+    def __read(self, season: str, events: Tuple[int, int], player_ids: List[int], team_ids: List[int]) -> pd.DataFrame:
+        """
+        Reads the latest version of the matching records of the given season.
+        """
+        import pyarrow.parquet as pq
+
+        files = self.__list_files(season, events)
+
+        filters = []
+        if player_ids is not None:
+            filters.append(('player_id', 'in', list(player_ids)))
+        if team_ids is not None:
+            filters.append(('team', 'in', list(team_ids)))
+
+        frames = []
+        for _, file_path in sorted(files):
+            # The records of a file without teams match no team filter.
+            if team_ids is not None and 'team' not in pq.read_schema(file_path).names:
+                continue
+
+            frames.append(pq.read_table(file_path, filters=filters or None).to_pandas())
+
+        if len(frames) == 0:
+            return pd.DataFrame(columns=REQUIRED_COLUMNS + ['season'])
+
+        df = pd.concat(frames, ignore_index=True).drop_duplicates(KEY, keep='last')
+        return df[~df[DELETED].astype(bool)].drop(columns=[DELETED]).reset_index(drop=True)
+
+
+def _get_seasons(kickoff_times: pd.Series) -> pd.Series:
+    """
+    Returns the season of each of the given kick-off times. A season starts in July.
+    """
+    kickoff_times = pd.to_datetime(kickoff_times, utc=True)
+    start_years = kickoff_times.dt.year - (kickoff_times.dt.month < 7).astype(int)
+    return start_years.map(lambda year: f'{year}/{(year + 1) % 100:02d}')
+
+
+def _get_changed(df: pd.DataFrame, latest_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the records of the given data frame that are not in the latest stored version or differ from it.
+    """
+    if len(latest_df) == 0:
+        return df
+
+    columns = [column for column in df.columns if column != DELETED]
+    hashes = pd.util.hash_pandas_object(df[columns].astype(str), index=False)
+    latest_hashes = set(pd.util.hash_pandas_object(latest_df.reindex(columns=columns).astype(str), index=False))
+    return df[~hashes.isin(latest_hashes)]
+
+
+def _get_value(name: str) -> str:
+    return name.split('=', 1)[1]
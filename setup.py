@@ -25,5 +25,6 @@ setup(name='pandas-fpl',
         ],
         packages=['fplpandas'],
         include_package_data=True,
-        install_requires=['pandas', 'fpl', 'backoff']
+        install_requires=['pandas', 'fpl'],
+        extras_require={'snapshot': ['pyarrow'], 'fast': ['orjson']}
 )
\ No newline at end of file
@@ -0,0 +1,61 @@
+import argparse
+import json
+
+# The measurements that are compared if both runs have them. For all of them, lower values are better.
+MEASUREMENTS = ['latency_s', 'network_s', 'conversion_s', 'peak_memory_bytes', 'import_s']
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> list:
+    """
+    Compares the results of two benchmark runs.
+
+    Args:
+        baseline: The results of the earlier run.
+        current: The results of the later run.
+        threshold: The relative increase above which a measurement is reported as a regression.
+
+    Returns:
+        The lines of the comparison. Regressions are marked with ``!``.
+    """
+    lines = []
+    for getter, results in current['getters'].items():
+        baseline_results = baseline['getters'].get(getter)
+        if baseline_results is None:
+            continue
+
+        for measurement in MEASUREMENTS:
+            if measurement not in baseline_results or measurement not in results:
+                continue
+
+            before, after = baseline_results[measurement], results[measurement]
+            change = (after - before) / before if before > 0 else 0.0
+            marker = '!' if change > threshold else ' '
+            lines.append(f'{marker} {getter:<16} {measurement:<18} {before:>14.4f} {after:>14.4f} {change:>+8.1%}')
+
+    return lines
+
+
+def main(args=None) -> int:
+    """
+    Prints the comparison of two result files, e.g.:
+
+        python tests/benchmark/compare.py benchmark_results/before.json benchmark_results/after.json
+    """
+    parser = argparse.ArgumentParser(description='Compares the results of two benchmark runs.')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    options = parser.parse_args(args)
+
+    with open(options.baseline) as file:
+        baseline = json.load(file)
+    with open(options.current) as file:
+        current = json.load(file)
+
+    lines = compare(baseline, current, options.threshold)
+    print('\n'.join(lines))
+    return 1 if any(line.startswith('!') for line in lines) else 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,89 @@
+import json
+import random
+from fpl.constants import API_URLS
+from fplpandas.replay import ResponseRecorder
+from fplpandas.schema import SCHEMAS, INT8, INT16, INT32, INT64, FLOAT, BOOL, CATEGORY, DATETIME
+
+# The sizes of a late-season payload of the FPL API.
+PLAYERS = 650
+TEAMS = 20
+EVENTS = 38
+FINISHED_EVENTS = 35
+PAST_SEASONS = 5
+USER_ID = 1
+
+
+def create_payloads(path: str, players: int = PLAYERS, teams: int = TEAMS, events: int = EVENTS,
+                    finished_events: int = FINISHED_EVENTS, seed: int = 0) -> dict:
+    """
+    Writes synthetic responses of the FPL API with realistic sizes to the given directory so that they can be served by
+    ``ReplayServer``. The records contain the columns described by ``schema.SCHEMAS``.
+
+    Args:
+        path: The directory of the recorded responses.
+        players: The number of players.
+        teams: The number of teams.
+        events: The number of game weeks.
+        finished_events: The number of game weeks that have been played.
+        seed: The seed for the random values.
+
+    Returns:
+        The sizes of the payloads.
+    """
+    rnd = random.Random(seed)
+    recorder = ResponseRecorder(path)
+
+    fixtures = [{**_create_record(SCHEMAS['fixtures'], rnd), 'id': fixture_id, 'event': fixture_id // (teams // 2) + 1,
+                 'team_h': fixture_id % teams + 1, 'team_a': (fixture_id + 1) % teams + 1, 'stats': []}
+                for fixture_id in range(events * teams // 2)]
+    elements = [{**_create_record(SCHEMAS['players'], rnd), 'id': player_id, 'web_name': f'Player {player_id}',
+                 'first_name': 'First', 'second_name': f'Second {player_id}', 'team': player_id % teams + 1}
+                for player_id in range(1, players + 1)]
+    static = {'elements': elements,
+              'teams': [{**_create_record(SCHEMAS['teams'], rnd), 'id': team_id, 'name': f'Team {team_id}'}
+                        for team_id in range(1, teams + 1)],
+              'events': [{**_create_record(SCHEMAS['game_weeks'], rnd), 'id': event, 'name': f'Gameweek {event}',
+                          'is_current': event == finished_events, 'chip_plays': [], 'top_element_info': None}
+                         for event in range(1, events + 1)]}
+
+    recorder.record(API_URLS['static'], json.dumps(static).encode())
+    recorder.record(API_URLS['fixtures'], json.dumps(fixtures).encode())
+
+    for element in elements:
+        summary = {'history_past': [{**_create_record(SCHEMAS['players_history_past'], rnd),
+                                     'season_name': f'{2014 + season}/{15 + season}'}
+                                    for season in range(PAST_SEASONS)],
+                   'history': [{**_create_record(SCHEMAS['players_history'], rnd), 'element': element['id'],
+                                'fixture': fixture['id'], 'round': fixture['event']}
+                               for fixture in fixtures if fixture['event'] <= finished_events
+                               and element['team'] in (fixture['team_h'], fixture['team_a'])],
+                   'fixtures': [{**_create_record(SCHEMAS['players_fixtures'], rnd), 'id': fixture['id'],
+                                 'event': fixture['event']}
+                                for fixture in fixtures if fixture['event'] > finished_events
+                                and element['team'] in (fixture['team_h'], fixture['team_a'])]}
+        recorder.record(API_URLS['player'].format(element['id']), json.dumps(summary).encode())
+
+    recorder.record(API_URLS['me'], json.dumps({'player': {'entry': USER_ID}}).encode())
+    user_team = {'picks': [{**_create_record(SCHEMAS['user_team_picks'], rnd), 'element': element['id']}
+                           for element in elements[:15]],
+                 'chips': [{'name': name, 'status_for_entry': 'available'} for name in ['wildcard', 'bboost', '3xc', 'freehit']],
+                 'transfers': {'limit': 1, 'made': 0, 'bank': 5, 'value': 1000}}
+    recorder.record(API_URLS['user_team'].format(USER_ID), json.dumps(user_team).encode())
+
+    return {'players': players, 'teams': teams, 'events': events, 'finished_events': finished_events,
+            'fixtures': len(fixtures)}
+
+
+def _create_record(schema: dict, rnd: random.Random) -> dict:
+    """
+    Returns a record with a random value of the kind given by the schema for each column.
+    """
+    values = {INT8: lambda: rnd.randint(0, 100),
+              INT16: lambda: rnd.randint(0, 1000),
+              INT32: lambda: rnd.randint(0, 1000),
+              INT64: lambda: rnd.randint(0, 1000),
+              FLOAT: lambda: f'{rnd.uniform(0, 100):.1f}',
+              BOOL: lambda: rnd.random() < 0.5,
+              CATEGORY: lambda: rnd.choice(['a', 'd', 'i', 's', 'u']),
+              DATETIME: lambda: f'2020-{rnd.randint(8, 12):02d}-{rnd.randint(1, 28):02d}T14:00:00Z'}
+    return {column: values[kind]() for column, kind in schema.items()}
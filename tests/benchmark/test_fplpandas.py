@@ -0,0 +1,226 @@
+import unittest
+import unittest.mock as mock
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import aiohttp
+import pandas as pd
+from fplpandas import FPLPandas
+from fplpandas.extensions import _create_fpl
+from fplpandas.http import RateLimiter, Session
+from fplpandas.replay import ReplayServer
+from .payloads import create_payloads, USER_ID
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+# The benchmarks only run if this variable is set, so that they are not part of the default test run.
+ENABLED = os.environ.get('BENCHMARK') == '1'
+
+# The number of times each getter is measured. The median is reported.
+RUNS = int(os.environ.get('BENCHMARK_RUNS', '3'))
+
+# The file the results are saved to. If not set, they are saved to a new file in benchmark_results/.
+OUTPUT = os.environ.get('BENCHMARK_OUTPUT')
+
+
+def _create_rate_limiter() -> RateLimiter:
+    """ Returns a rate limiter that does not limit the requests to the local server.
+    """
+    return RateLimiter(rate=1e6, max_rate=1e6, burst=10 ** 6, max_concurrency=100)
+
+
+# The modules that importing the package must not import, because they are only needed for network access.
+NETWORK_MODULES = ['aiohttp', 'fpl']
+
+
+def _measure_import(statement: str) -> tuple:
+    """ Executes the given import statement in a new interpreter.
+
+    Returns:
+        1: The seconds the statement took.
+        2: The network modules that were imported by the statement.
+    """
+    code = (f'import json, sys, time\nstart = time.perf_counter()\n{statement}\n'
+            f'print(json.dumps([time.perf_counter() - start, [m for m in {NETWORK_MODULES!r} if m in sys.modules]]))')
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return tuple(json.loads(output.splitlines()[-1]))
+
+
+@unittest.skipUnless(ENABLED, 'Set BENCHMARK=1 to run the benchmarks.')
+class TestBenchmark(unittest.TestCase):
+    """
+    Measures the getters of ``FPLPandas`` against a ``ReplayServer`` with late-season payloads. For each getter, it
+    reports the latency, the throughput in requests and rows per second, the peak memory allocated by Python including
+    the in-process server, the time spent downloading the JSON and the time spent converting it to data frames. The
+    results are saved as JSON so that runs can be compared with ``compare.py``. It also measures the time it takes to
+    import the package in a new interpreter and checks that the import does not load the network modules.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        log.info('Creating payloads ...')
+        cls.sizes = create_payloads(cls.temp_dir.name)
+        cls.results = {}
+
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        cls.server = ReplayServer(cls.temp_dir.name)
+        asyncio.run_coroutine_threadsafe(cls.server.start(), cls.loop).result()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.server.close(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+        cls.temp_dir.cleanup()
+
+        output = OUTPUT
+        if output is None:
+            os.makedirs('benchmark_results', exist_ok=True)
+            output = os.path.join('benchmark_results', f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+
+        with open(output, 'w') as file:
+            json.dump({'created': datetime.now(timezone.utc).isoformat(), 'python': platform.python_version(),
+                       'pandas': pd.__version__, 'runs': RUNS, 'sizes': cls.sizes, 'getters': cls.results},
+                      file, indent=2)
+        log.info(f'Saved benchmark results to {output}.')
+
+    def __benchmark(self, name: str, func, fetch, fpl_mock: mock.MagicMock) -> None:
+        """
+        Measures the given getter and stores the results under the given name.
+
+        Args:
+            name: The name of the getter.
+            func: The function that calls the getter on the ``FPLPandas`` instance it is passed.
+            fetch: The coroutine function that downloads the JSON of the getter with the FPL instance it is passed.
+            fpl_mock: The FPL mock whose methods return the downloaded JSON.
+        """
+        latencies, network_times, conversion_times = [], [], []
+        requests = rows = 0
+
+        for _ in range(RUNS):
+            start_requests = self.server.requests
+            with FPLPandas('email', 'password', base_url=self.server.base_url,
+                           rate_limiter=_create_rate_limiter()) as fpl:
+                start = time.perf_counter()
+                result = func(fpl)
+                latencies.append(time.perf_counter() - start)
+            requests = self.server.requests - start_requests
+            rows = sum(len(df) for df in (result if isinstance(result, list) else [result]))
+
+            start = time.perf_counter()
+            json_data = asyncio.run(self.__fetch(fetch))
+            network_times.append(time.perf_counter() - start)
+
+            fpl_mock.configure(json_data)
+            with FPLPandas('email', 'password', fpl=fpl_mock) as fpl:
+                start = time.perf_counter()
+                func(fpl)
+                conversion_times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            with FPLPandas('email', 'password', base_url=self.server.base_url,
+                           rate_limiter=_create_rate_limiter()) as fpl:
+                func(fpl)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latency = statistics.median(latencies)
+        self.results[name] = {'latency_s': latency, 'latency_min_s': min(latencies), 'latency_max_s': max(latencies),
+                              'requests': requests, 'requests_per_s': requests / latency, 'rows': rows,
+                              'rows_per_s': rows / latency, 'network_s': statistics.median(network_times),
+                              'conversion_s': statistics.median(conversion_times), 'peak_memory_bytes': peak_memory}
+        log.info(f'{name}: {json.dumps(self.results[name])}')
+
+    async def __fetch(self, fetch):
+        """ Downloads the JSON of a getter from the server without converting it.
+        """
+        async with aiohttp.ClientSession() as client_session:
+            fpl = _create_fpl(Session(client_session, _create_rate_limiter(), base_url=self.server.base_url))
+            await fpl.refresh()
+            return await fetch(fpl)
+
+    def test_import(self):
+        for name, statement in [('import', 'import fplpandas'),
+                                ('import_snapshot', 'from fplpandas import load_snapshot'),
+                                ('import_fplpandas', 'from fplpandas import FPLPandas')]:
+            measurements = [_measure_import(statement) for _ in range(RUNS)]
+            self.assertEqual(measurements[0][1], [], f'{statement} imports network modules.')
+
+            times = [seconds for seconds, _ in measurements]
+            self.results[name] = {'import_s': statistics.median(times), 'import_min_s': min(times),
+                                  'import_max_s': max(times)}
+            log.info(f'{name}: {json.dumps(self.results[name])}')
+
+    def test_get_teams(self):
+        async def fetch(fpl):
+            return await fpl.get_teams(None, return_json=True)
+
+        self.__benchmark('get_teams', lambda fpl: fpl.get_teams(), fetch,
+                         _FplMock(lambda json_data: {'get_teams': json_data}))
+
+    def test_get_game_weeks(self):
+        async def fetch(fpl):
+            return await fpl.get_gameweeks(None, return_json=True)
+
+        self.__benchmark('get_game_weeks', lambda fpl: fpl.get_game_weeks(), fetch,
+                         _FplMock(lambda json_data: {'get_gameweeks': json_data}))
+
+    def test_get_players(self):
+        async def fetch(fpl):
+            return await fpl.get_players(None, include_summary=True, return_json=True)
+
+        self.__benchmark('get_players', lambda fpl: fpl.get_players(), fetch,
+                         _FplMock(lambda json_data: {'get_players': json_data}))
+
+    def test_get_fixtures(self):
+        async def fetch(fpl):
+            return await fpl.get_fixtures(return_json=True)
+
+        self.__benchmark('get_fixtures', lambda fpl: fpl.get_fixtures(), fetch,
+                         _FplMock(lambda json_data: {'get_fixtures': json_data}))
+
+    def test_get_user_team(self):
+        async def fetch(fpl):
+            await fpl.login('email', 'password')
+            return await fpl.get_user_info(), await fpl.get_user_team(USER_ID)
+
+        self.__benchmark('get_user_team', lambda fpl: fpl.get_user_team(), fetch,
+                         _FplMock(lambda json_data: {'login': None, 'get_user_info': json_data[0],
+                                                     'get_user_team': json_data[1]}))
+
+
+class _FplMock(mock.MagicMock):
+    """
+    An FPL mock whose methods return previously downloaded JSON so that only the conversion is measured.
+    """
+
+    def __init__(self, get_results=None, **kwargs):
+        super().__init__(**kwargs)
+        self.__get_results = get_results
+
+    def configure(self, json_data) -> None:
+        for method, result in self.__get_results(json_data).items():
+            async def method_mock(*args, result=result, **kwargs):
+                return result
+
+            setattr(self, method, method_mock)
+
+
+if __name__ == '__main__':
+    unittest.main()
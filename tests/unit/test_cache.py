@@ -0,0 +1,104 @@
+import unittest
+import asyncio
+import tempfile
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fpl.utils import fetch
+from fplpandas.cache import CacheEntry, ResponseCache
+from fplpandas.http import Session
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_get(self):
+        cache = ResponseCache(self.temp_dir.name)
+        cache.put(CacheEntry('http://test/1', b'{"id": 1}', etag='"1"'))
+
+        entry = ResponseCache(self.temp_dir.name).get('http://test/1')
+
+        self.assertEqual(entry.body, b'{"id": 1}')
+        self.assertEqual(entry.validators(), {'If-None-Match': '"1"'})
+        self.assertIsNone(cache.get('http://test/2'))
+
+    def test_evict_least_recently_used(self):
+        cache = ResponseCache(self.temp_dir.name, max_size=20)
+        cache.put(CacheEntry('http://test/1', b'1' * 8, etag='"1"'))
+        cache.put(CacheEntry('http://test/2', b'2' * 8, etag='"2"'))
+        cache.get('http://test/1')
+        cache.put(CacheEntry('http://test/3', b'3' * 8, etag='"3"'))
+
+        self.assertIsNotNone(cache.get('http://test/1'))
+        self.assertIsNone(cache.get('http://test/2'))
+        self.assertIsNotNone(cache.get('http://test/3'))
+        self.assertEqual(cache.size, 16)
+
+    def test_max_entries(self):
+        cache = ResponseCache(self.temp_dir.name, max_entries=1)
+        cache.put(CacheEntry('http://test/1', b'1', etag='"1"'))
+        cache.put(CacheEntry('http://test/2', b'2', etag='"2"'))
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get('http://test/1'))
+
+    def test_conditional_request(self):
+        requests = []
+
+        async def handle(request):
+            requests.append(request.headers.get('If-None-Match'))
+            if request.headers.get('If-None-Match') == '"v1"':
+                return web.Response(status=304, headers={'ETag': '"v1"'})
+            return web.json_response({'id': 1}, headers={'ETag': '"v1"'})
+
+        async def fetch_twice():
+            app = web.Application()
+            app.router.add_get('/api/test/', handle)
+            cache = ResponseCache(self.temp_dir.name)
+
+            async with TestServer(app) as server, aiohttp.ClientSession() as client_session:
+                session = Session(client_session, cache=cache)
+                url = str(server.make_url('/api/test/'))
+                return await fetch(session, url), await fetch(session, url)
+
+        first, second = asyncio.run(fetch_twice())
+
+        self.assertEqual(first, {'id': 1})
+        self.assertEqual(second, {'id': 1})
+        self.assertEqual(requests, [None, '"v1"'])
+
+    def test_private_endpoints_not_cached(self):
+        requests = []
+
+        async def handle(request):
+            requests.append(request.headers.get('If-None-Match'))
+            return web.json_response({'player': {'first_name': 'Test'}}, headers={'ETag': '"v1"'})
+
+        async def fetch_twice():
+            app = web.Application()
+            app.router.add_get('/api/me/', handle)
+            app.router.add_get('/api/my-team/1/', handle)
+            cache = ResponseCache(self.temp_dir.name)
+
+            async with TestServer(app) as server, aiohttp.ClientSession() as client_session:
+                session = Session(client_session, cache=cache)
+                for path in ['/api/me/', '/api/my-team/1/'] * 2:
+                    await fetch(session, str(server.make_url(path)))
+
+            return cache
+
+        cache = asyncio.run(fetch_twice())
+
+        self.assertEqual(requests, [None] * 4)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
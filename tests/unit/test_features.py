@@ -0,0 +1,79 @@
+import unittest
+import unittest.mock as mock
+from fplpandas import FPLPandas
+from fplpandas.features import PlayerFeatures
+import logging as log
+import pandas as pd
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+def create_history_df(points: dict) -> pd.DataFrame:
+    records = [{'player_id': player_id, 'fixture': player_id * 100 + game, 'round': game + 1,
+                'kickoff_time': f'2020-09-{12 + game:02d}T14:00:00Z', 'total_points': game_points,
+                'minutes': 90 if game_points > 0 else 45, 'value': 50, 'was_home': game % 2 == 0}
+               for player_id, player_points in points.items() for game, game_points in enumerate(player_points)]
+    return pd.DataFrame.from_records(records).set_index(['player_id', 'fixture'])
+
+
+class TestPlayerFeatures(unittest.TestCase):
+    def test_update(self):
+        features = PlayerFeatures(window=2)
+
+        delta_df = features.update(create_history_df({2: [0, 4, 2], 1: [6, 0]}))
+        self.assertEqual(delta_df.index.tolist(), [(1, 100), (1, 101), (2, 200), (2, 201), (2, 202)])
+        self.assertEqual(features.df.index.tolist(), delta_df.index.tolist())
+        self.assertEqual(features.df.loc[2, 'form'].tolist(), [0.0, 2.0, 3.0])
+        self.assertEqual(features.df.loc[2, 'points_per_million'].tolist(), [0.0, 0.8, 1.2])
+        self.assertEqual(features.df.loc[2, 'minutes_share'].tolist(), [0.5, 0.75, 5 / 6])
+        self.assertEqual(features.df.loc[(2, 202), 'home_points_per_game'], 1.0)
+        self.assertEqual(features.df.loc[(2, 202), 'away_points_per_game'], 4.0)
+        self.assertTrue(pd.isna(features.df.loc[(1, 100), 'away_points_per_game']))
+
+        delta_df = features.update(create_history_df({2: [0, 4, 2], 1: [6, 0, 3]}))
+        self.assertEqual(delta_df.index.get_level_values('player_id').unique().tolist(), [1])
+        self.assertEqual(features.df.loc[1, 'form'].tolist(), [6.0, 3.0, 1.5])
+        self.assertEqual(len(features.df), 6)
+
+        delta_df = features.update(create_history_df({2: [0, 4, 2]}))
+        self.assertEqual(len(delta_df), 0)
+        self.assertEqual(features.df.index.get_level_values('player_id').unique().tolist(), [2])
+
+    def test_update_missing_venue(self):
+        history_df = create_history_df({1: [2, 6, 3]})
+        history_df['was_home'] = [True, None, False]
+
+        features = PlayerFeatures()
+        features.update(history_df)
+
+        self.assertEqual(features.df.loc[1, 'home_points_per_game'].tolist(), [2.0, 2.0, 2.0])
+        self.assertEqual(features.df.loc[(1, 102), 'away_points_per_game'], 3.0)
+        self.assertEqual(features.df.loc[(1, 102), 'form'], 11 / 3)
+
+    def test_update_missing_columns(self):
+        with self.assertRaisesRegex(ValueError, 'was_home'):
+            PlayerFeatures().update(create_history_df({1: [2]}).drop(columns=['was_home']))
+
+    def test_fpl_pandas_features(self):
+        test_data = [{'id': 1, 'history_past': [], 'fixtures': [],
+                      'history': [{'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 2,
+                                   'minutes': 90, 'value': 40, 'was_home': True}]}]
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            return test_data
+
+        fpl_mock.get_players = mock_get_players
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            _, _, history_df, _ = fpl.get_players()
+
+        features = PlayerFeatures()
+        features.update(history_df)
+        self.assertEqual(features.df.loc[(1, 1), 'points_per_million'], 0.5)
+        self.assertEqual(features.df.loc[(1, 1), 'home_points_per_game'], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
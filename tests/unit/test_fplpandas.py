@@ -2,7 +2,8 @@ import unittest
 import unittest.mock as mock
 import asyncio
 import warnings
-from fplpandas import FPLPandas
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from fplpandas import FPLPandas, AsyncFPLPandas
 import logging as log
 import pandas as pd
 from pandas.util.testing import assert_frame_equal
@@ -89,8 +90,7 @@ class TestFplPandas(unittest.TestCase):
 
         fpl_mock = mock.MagicMock()
 
-        @asyncio.coroutine
-        def mock_get_fixtures(return_json):
+        async def mock_get_fixtures(return_json):
             self.assertEqual(return_json, True)
             return test_data
 
@@ -102,6 +102,38 @@ class TestFplPandas(unittest.TestCase):
 
         self.assertTrue(expected_df.equals(actual_df))
 
+    def test_get_fixtures_by_events(self):
+        fixtures = {1: [{'id': 1, 'event': 1, 'finished': True}, {'id': 2, 'event': 1, 'finished': True}],
+                    2: [{'id': 3, 'event': 2, 'finished': True}, {'id': 4, 'event': 2, 'finished': False}],
+                    3: [{'id': 5, 'event': 3, 'finished': True}]}
+        requested = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_fixtures_by_gameweek(gameweek, return_json):
+            requested.append(gameweek)
+            await asyncio.sleep(0.001)
+            return fixtures[gameweek]
+
+        async def mock_get_fixtures(return_json):
+            return [fixture for event_fixtures in fixtures.values() for fixture in event_fixtures]
+
+        fpl_mock.get_fixtures_by_gameweek = mock_get_fixtures_by_gameweek
+        fpl_mock.get_fixtures = mock_get_fixtures
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            actual_df = fpl.get_fixtures(events=[2, 1])
+            self.assertEqual(actual_df.index.tolist(), [3, 4, 1, 2])
+            self.assertEqual(sorted(requested), [1, 2])
+
+            fpl.get_fixtures(events=[1, 2])
+            self.assertEqual(sorted(requested[2:]), [2])
+
+            fpl.get_fixtures()
+            actual_df = fpl.get_fixtures(events=[3], columns=['finished'])
+            self.assertEqual(sorted(requested[3:]), [])
+            self.assertEqual(actual_df.columns.tolist(), ['finished'])
+
     def test_get_player(self):
         test_data = {'id': 1, 'attr1': 'value11', 'attr2': 'value12',
                           'history_past': [{'season_name': '2017/18', 'attr1': 'value11', 'attr2': 'value12'},
@@ -297,6 +329,183 @@ class TestFplPandas(unittest.TestCase):
         assert_frame_equal(expected_history_df, actual_history_df)
         assert_frame_equal(expected_fixtures_df, actual_fixture_df)
 
+    def test_get_players_with_different_columns(self):
+        test_data = [{'id': 1, 'attr1': 'value11',
+                      'history_past': [],
+                      'history': [{'fixture': 1, 'attr1': 'value11'}],
+                      'fixtures': []},
+                     {'id': 2, 'attr1': 'value21',
+                      'history_past': [],
+                      'history': [{'fixture': 1, 'attr1': 'value21', 'attr2': 'value22'}],
+                      'fixtures': []}]
+
+        expected_history = [{'fixture': 1, 'attr1': 'value11', 'player_id': 1},
+                            {'fixture': 1, 'attr1': 'value21', 'player_id': 2, 'attr2': 'value22'}]
+        expected_history_df = pd.DataFrame.from_dict(expected_history).set_index(['player_id', 'fixture'])
+        expected_fixtures_df = pd.DataFrame(columns=['player_id', 'event']).set_index(['player_id', 'event'])
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            return test_data
+
+        fpl_mock.get_players = mock_get_players
+
+        fpl = FPLPandas(fpl=fpl_mock)
+        _, _, actual_history_df, actual_fixture_df = fpl.get_players()
+
+        assert_frame_equal(expected_history_df, actual_history_df)
+        assert_frame_equal(expected_fixtures_df, actual_fixture_df, check_index_type=False)
+
+    def test_get_players_incremental(self):
+        elements = {1: {'id': 1, 'team': 1, 'total_points': 10, 'minutes': 90},
+                    2: {'id': 2, 'team': 2, 'total_points': 5, 'minutes': 45},
+                    3: {'id': 3, 'team': 3, 'total_points': 0, 'minutes': 0}}
+        fixtures = [{'id': 1, 'event': 1, 'finished': True, 'team_h': 1, 'team_a': 2},
+                    {'id': 2, 'event': 2, 'finished': False, 'kickoff_time': '2099-08-01T14:00:00Z',
+                     'team_h': 1, 'team_a': 2, 'team_h_difficulty': 3, 'team_a_difficulty': 3}]
+        summaries = {1: {'history_past': [], 'history': [{'fixture': 1, 'total_points': 10}],
+                         'fixtures': [{'event': 2, 'kickoff_time': '2099-08-01T14:00:00Z'}]},
+                     2: {'history_past': [], 'history': [{'fixture': 1, 'total_points': 5}],
+                         'fixtures': [{'event': 2, 'kickoff_time': '2099-08-01T14:00:00Z'}]},
+                     3: {'history_past': [], 'history': [],
+                         'fixtures': [{'event': 1, 'kickoff_time': '2000-08-01T14:00:00Z'}]}}
+        summary_ids = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            if not include_summary:
+                return [dict(element) for element in elements.values() if player_ids is None or element['id'] in player_ids]
+
+            summary_ids.append(player_ids)
+            return [{**elements[player_id], **summaries[player_id]} for player_id in player_ids]
+
+        async def mock_get_fixtures(return_json):
+            return [dict(fixture) for fixture in fixtures]
+
+        fpl_mock.get_players = mock_get_players
+        fpl_mock.get_fixtures = mock_get_fixtures
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            fpl.get_players(incremental=True)
+            self.assertEqual(summary_ids, [[1, 2, 3]])
+
+            summaries[3] = {'history_past': [], 'history': [{'fixture': 2, 'total_points': 0}],
+                            'fixtures': [{'event': 2, 'kickoff_time': '2099-08-01T14:00:00Z'}]}
+            fpl.get_players(incremental=True)
+            self.assertEqual(summary_ids, [[1, 2, 3], [3]])
+
+            fpl.get_players(incremental=True)
+            self.assertEqual(len(summary_ids), 2)
+
+            elements[2] = {'id': 2, 'team': 2, 'total_points': 7, 'minutes': 90}
+            summaries[2] = {'history_past': [], 'history': [{'fixture': 1, 'total_points': 5}, {'fixture': 2, 'total_points': 2}],
+                            'fixtures': [{'event': 3, 'kickoff_time': '2099-08-08T14:00:00Z'}]}
+            players_df, _, history_df, fixtures_df = fpl.get_players(incremental=True)
+
+            self.assertEqual(summary_ids[-1], [2])
+            self.assertEqual(players_df.loc[2, 'total_points'], 7)
+            self.assertEqual(history_df.index.tolist(), [(1, 1), (2, 1), (2, 2), (3, 2)])
+            self.assertEqual(fixtures_df.index.tolist(), [(1, 2), (2, 3), (3, 2)])
+
+            del elements[1]
+            players_df, _, history_df, _ = fpl.get_players(incremental=True)
+
+            self.assertEqual(len(summary_ids), 3)
+            self.assertEqual(players_df.index.tolist(), [2, 3])
+            self.assertEqual(history_df.index.tolist(), [(2, 1), (2, 2), (3, 2)])
+
+            fpl.get_players([2], incremental=True)
+            self.assertEqual(summary_ids[-1], [2])
+            self.assertEqual(len(summary_ids), 4)
+
+            elements[1] = {'id': 1, 'team': 1, 'total_points': 10, 'minutes': 90}
+            fpl.get_players(incremental=True)
+            self.assertEqual(sorted(summary_ids[-1]), [1, 2, 3])
+
+            fixtures[1] = {**fixtures[1], 'team_a_difficulty': 4}
+            fpl.get_players(incremental=True)
+            self.assertEqual(summary_ids[-1], [2])
+
+            fixtures[1] = {**fixtures[1], 'kickoff_time': '2099-08-02T14:00:00Z'}
+            fpl.get_players(incremental=True)
+            self.assertEqual(sorted(summary_ids[-1]), [1, 2])
+            self.assertEqual(len(summary_ids), 7)
+
+    def test_get_players_with_columns(self):
+        test_data = [{'id': player_id, 'attr1': f'value{player_id}', 'attr2': 'value2',
+                      'history_past': [{'season_name': '2018/19', 'attr1': 'value11'}],
+                      'history': [{'fixture': 1, 'attr1': 'value11', 'attr2': 'value12'}],
+                      'fixtures': [{'event': 3, 'attr1': 'value31', 'kickoff_time': '2099-08-01T14:00:00Z'}]}
+                     for player_id in range(1, 3)]
+        columns = {'players': ['attr1'], 'players_history': ['attr2', 'attr3'], 'players_fixtures': ['attr1']}
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            if include_summary:
+                return test_data
+            return [{key: value for key, value in player.items() if key not in ['history_past', 'history', 'fixtures']}
+                    for player in test_data]
+
+        async def mock_get_teams(team_ids, return_json):
+            return [{'id': 1, 'attr1': 'value11', 'attr2': 'value12'}]
+
+        async def mock_get_fixtures(return_json):
+            return []
+
+        fpl_mock.get_players = mock_get_players
+        fpl_mock.get_teams = mock_get_teams
+        fpl_mock.get_fixtures = mock_get_fixtures
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            expected_dfs = fpl.get_players()
+            for incremental in [False, True]:
+                players_df, history_past_df, history_df, fixtures_df = fpl.get_players(incremental=incremental,
+                                                                                       columns=columns)
+
+                assert_frame_equal(expected_dfs[0][['attr1']], players_df)
+                assert_frame_equal(expected_dfs[1], history_past_df)
+                assert_frame_equal(expected_dfs[2][['attr2']], history_df[['attr2']])
+                self.assertTrue(history_df['attr3'].isna().all())
+                assert_frame_equal(expected_dfs[3][['attr1']], fixtures_df)
+
+            teams_df = fpl.get_teams(columns=['attr2'])
+
+        self.assertEqual(teams_df.columns.tolist(), ['attr2'])
+
+    def test_iter_players(self):
+        test_data = [{'id': player_id, 'attr1': f'value{player_id}',
+                      'history_past': [{'season_name': '2018/19', 'attr1': 'value11'}],
+                      'history': [{'fixture': 1, 'attr1': 'value11'}, {'fixture': 2, 'attr1': 'value21'}],
+                      'fixtures': [{'event': 3, 'attr1': 'value31'}]}
+                     for player_id in range(1, 6)]
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            if include_summary:
+                return test_data
+            return [{'id': player['id'], 'attr1': player['attr1']} for player in test_data]
+
+        async def mock_get_player(player_id, players, include_summary, return_json):
+            self.assertEqual(include_summary, True)
+            await asyncio.sleep(0.001 * (5 - player_id))
+            return test_data[player_id - 1]
+
+        fpl_mock.get_players = mock_get_players
+        fpl_mock.get_player = mock_get_player
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            batches = list(fpl.iter_players(batch_size=2))
+            expected_dfs = fpl.get_players()
+
+        self.assertEqual([batch[0].shape[0] for batch in batches], [2, 2, 1])
+        for i, expected_df in enumerate(expected_dfs):
+            actual_df = pd.concat([batch[i] for batch in batches]).sort_index()
+            assert_frame_equal(expected_df, actual_df)
+
     def test_get_user_team_with_user(self):
         test_data = {'picks': [{'element': 1, 'attr1': 'value11', 'attr2': 'value12'},
                             {'element': 2, 'attr1': 'value21', 'attr2': 'value22'}],
@@ -396,6 +605,473 @@ class TestFplPandas(unittest.TestCase):
 
         assert_frame_equal(expected_df, actual_df)
 
+    def test_get_user_teams(self):
+        logins = []
+        running = []
+        max_running = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            logins.append(email)
+            await asyncio.sleep(0.001)
+
+        async def mock_get_user_team(user_id):
+            running.append(user_id)
+            max_running.append(len(running))
+            await asyncio.sleep(0.001)
+            running.remove(user_id)
+            if user_id == 3:
+                raise ValueError('User 3 not found')
+            if user_id == 4:
+                return {'detail': 'Not found.'}
+            return {'picks': [{'element': user_id * 10, 'position': 1}, {'element': user_id * 10 + 1, 'position': 2}],
+                    'chips': [{'name': 'wildcard', 'status_for_entry': 'available'}],
+                    'transfers': {'limit': 1, 'made': 0}}
+
+        fpl_mock.get_user_team = mock_get_user_team
+        fpl_mock.login = mock_login
+
+        with FPLPandas('email', 'password', fpl=fpl_mock) as fpl:
+            picks_df, chips_df, transfers_df, errors_df = fpl.get_user_teams([1, 2, 3, 4], max_concurrency=2)
+
+        self.assertEqual(logins, ['email'])
+        self.assertLessEqual(max(max_running), 2)
+        self.assertEqual(picks_df.index.names, ['user_id', 'player_id'])
+        self.assertEqual(picks_df.index.tolist(), [(1, 10), (1, 11), (2, 20), (2, 21)])
+        self.assertEqual(chips_df.index.tolist(), [1, 2])
+        self.assertEqual(transfers_df['limit'].tolist(), [1, 1])
+        self.assertEqual(errors_df.index.tolist(), [3, 4])
+        self.assertEqual(errors_df.loc[3, 'error'], 'User 3 not found')
+        self.assertIn('Not found.', errors_df.loc[4, 'error'])
+
+    def test_get_user_teams_no_credentials(self):
+        fpl_mock = mock.MagicMock()
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            with self.assertRaisesRegex(ValueError, 'Email not provided'):
+                fpl.get_user_teams([1, 2])
+
+    def test_get_user_teams_login_failed(self):
+        logins = []
+        requested = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            logins.append(email)
+            raise ValueError('Incorrect email or password')
+
+        async def mock_get_user_team(user_id):
+            requested.append(user_id)
+            return {'picks': [], 'chips': [], 'transfers': {}}
+
+        fpl_mock.login = mock_login
+        fpl_mock.get_user_team = mock_get_user_team
+
+        with FPLPandas('email', 'password', fpl=fpl_mock) as fpl:
+            with self.assertRaisesRegex(ValueError, 'Incorrect email or password'):
+                fpl.get_user_teams([1, 2, 3])
+
+        self.assertEqual(logins, ['email'])
+        self.assertEqual(requested, [])
+
+    def test_get_user_picks_and_histories(self):
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_user_picks(user_id, event):
+            self.assertEqual(event, 3)
+            return {'picks': [{'element': user_id, 'position': 1}], 'automatic_subs': [],
+                    'entry_history': {'event': event, 'points': user_id * 10}}
+
+        async def mock_get_user_history(user_id):
+            return {'current': [{'event': 1, 'points': 50}, {'event': 2, 'points': 60}],
+                    'past': [{'season_name': '2019/20', 'total_points': 2000}],
+                    'chips': []}
+
+        fpl_mock.get_user_picks = mock_get_user_picks
+        fpl_mock.get_user_history = mock_get_user_history
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            picks_df, history_df, errors_df = fpl.get_user_picks([1, 2], 3)
+            current_df, past_df, chips_df, history_errors_df = fpl.get_user_histories([1, 2])
+
+        self.assertEqual(picks_df.index.tolist(), [(1, 1), (2, 2)])
+        self.assertEqual(history_df['points'].tolist(), [10, 20])
+        self.assertEqual(len(errors_df), 0)
+        self.assertEqual(current_df.index.names, ['user_id', 'event'])
+        self.assertEqual(current_df.index.tolist(), [(1, 1), (1, 2), (2, 1), (2, 2)])
+        self.assertEqual(past_df.index.tolist(), [(1, '2019/20'), (2, '2019/20')])
+        self.assertEqual(len(chips_df), 0)
+        self.assertEqual(len(history_errors_df), 0)
+
+    def test_conversion_pool(self):
+        players = [{'id': player_id, 'team': player_id % 20, 'news': None if player_id < 150 else 'Injured',
+                    'chance_of_playing_next_round': None if player_id <= 100 else 75,
+                    'history_past': [{'season_name': '2019/20', 'total_points': player_id}],
+                    'history': [{'fixture': fixture, 'total_points': fixture} for fixture in range(player_id % 3)],
+                    'fixtures': [{'event': 30, 'is_home': True}]} for player_id in range(1, 251)]
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            return players
+
+        async def mock_get_user_history(user_id):
+            return {'current': [{'event': 1, 'points': user_id, 'bank': None if user_id <= 100 else 5}], 'past': [],
+                    'chips': [{'name': 'wildcard', 'event': 2}] if user_id > 200 else []}
+
+        fpl_mock.get_players = mock_get_players
+        fpl_mock.get_user_history = mock_get_user_history
+        user_ids = list(range(1, 251))
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            expected_dfs = fpl.get_players() + fpl.get_user_histories(user_ids)
+
+        with ProcessPoolExecutor(2) as pool, FPLPandas(fpl=fpl_mock, conversion_pool=pool) as fpl:
+            actual_dfs = fpl.get_players() + fpl.get_user_histories(user_ids)
+
+        self.assertEqual(expected_dfs[0]['chance_of_playing_next_round'].dtype, 'float64')
+        self.assertEqual(len(actual_dfs), len(expected_dfs))
+        for expected_df, actual_df in zip(expected_dfs, actual_dfs):
+            assert_frame_equal(expected_df, actual_df)
+
+    def test_get_user_getters_with_columns(self):
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            pass
+
+        async def mock_get_user_team(user_id):
+            return {'picks': [{'element': user_id * 10, 'position': 1, 'multiplier': 2, 'selling_price': 50}],
+                    'chips': [{'name': 'wildcard', 'status_for_entry': 'available'}],
+                    'transfers': {'limit': 1, 'made': 0, 'bank': 5}}
+
+        async def mock_get_user_picks(user_id, event):
+            return {'picks': [{'element': user_id, 'position': 1, 'multiplier': 1}],
+                    'entry_history': {'event': event, 'points': user_id * 10, 'bank': 0}}
+
+        fpl_mock.login = mock_login
+        fpl_mock.get_user_team = mock_get_user_team
+        fpl_mock.get_user_picks = mock_get_user_picks
+
+        with FPLPandas('email', 'password', fpl=fpl_mock) as fpl:
+            picks_df, chips_df, transfers_df = fpl.get_user_team(1, columns={'picks': ['multiplier'],
+                                                                             'transfers': ['bank', 'wildcard']})
+            self.assertEqual(picks_df.columns.tolist(), ['multiplier'])
+            self.assertEqual(chips_df.columns.tolist(), ['name', 'status_for_entry'])
+            self.assertEqual(transfers_df.columns.tolist(), ['bank', 'wildcard'])
+
+            picks_df, chips_df, transfers_df, _ = fpl.get_user_teams([1, 2], columns={'picks': ['player_id', 'multiplier'],
+                                                                                       'chips': ['name']})
+            self.assertEqual(picks_df.index.names, ['user_id', 'player_id'])
+            self.assertEqual(picks_df.index.tolist(), [(1, 10), (2, 20)])
+            self.assertEqual(picks_df.columns.tolist(), ['multiplier'])
+            self.assertEqual(chips_df.columns.tolist(), ['name'])
+            self.assertEqual(transfers_df.columns.tolist(), ['limit', 'made', 'bank'])
+
+            picks_df, history_df, _ = fpl.get_user_picks([1, 2], 3, columns={'entry_history': ['points']})
+            self.assertEqual(picks_df.columns.tolist(), ['position', 'multiplier'])
+            self.assertEqual(history_df.index.names, ['user_id'])
+            self.assertEqual(history_df['points'].tolist(), [10, 20])
+            self.assertEqual(history_df.columns.tolist(), ['points'])
+
+    def test_login_reused_across_calls(self):
+        test_data = {'picks': [{'element': 1}], 'chips': [], 'transfers': {}}
+        logins = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            logins.append(email)
+
+        async def mock_get_user_team(user_id):
+            return test_data
+
+        fpl_mock.get_user_team = mock_get_user_team
+        fpl_mock.login = mock_login
+
+        fpl = FPLPandas('email', 'password', fpl=fpl_mock)
+        fpl.get_user_team(456)
+        fpl.get_user_team(456)
+        self.assertEqual(len(logins), 1)
+
+        fpl.set_cred('email2', 'password')
+        fpl.get_user_team(456)
+        self.assertEqual(logins, ['email', 'email2'])
+
+    def test_set_cred_during_login(self):
+        logins = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            logins.append(email)
+            if len(logins) == 1:
+                fpl.set_cred('email2', 'password')
+
+        async def mock_get_user_team(user_id):
+            return {'picks': [{'element': 1}], 'chips': [], 'transfers': {}}
+
+        fpl_mock.get_user_team = mock_get_user_team
+        fpl_mock.login = mock_login
+        fpl = AsyncFPLPandas('email', 'password', fpl=fpl_mock)
+
+        async def get_user_team_twice():
+            async with fpl:
+                await fpl.get_user_team(456)
+                await fpl.get_user_team(456)
+
+        asyncio.run(get_user_team_twice())
+        self.assertEqual(logins, ['email', 'email2'])
+
+    def test_login_expired(self):
+        test_data = {'picks': [{'element': 1}], 'chips': [], 'transfers': {}}
+        logins = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            logins.append(email)
+
+        async def mock_get_user_team(user_id):
+            return test_data
+
+        fpl_mock.get_user_team = mock_get_user_team
+        fpl_mock.login = mock_login
+
+        fpl = FPLPandas('email', 'password', fpl=fpl_mock, login_ttl=0)
+        fpl.get_user_team(456)
+        fpl.get_user_team(456)
+        self.assertEqual(len(logins), 2)
+
+    def test_session_reused_and_closed(self):
+        static = {'teams': [{'id': 1, 'attr1': 'value11'}], 'events': [], 'elements': []}
+        sessions = []
+
+        async def mock_fetch(session, url):
+            sessions.append(session)
+            return static
+
+        with mock.patch('fplpandas.extensions.fetch', mock_fetch):
+            with FPLPandas(pool_size=5) as fpl:
+                fpl.get_teams()
+                fpl.get_teams()
+
+                self.assertEqual(len(sessions), 1)
+                session = sessions[0]
+                self.assertEqual(session.connector.limit, 5)
+                self.assertFalse(session.closed)
+
+        self.assertTrue(session.closed)
+        fpl.close()
+
+    def test_get_teams_from_threads(self):
+        test_data = [{'id': 1, 'attr1': 'value11'}, {'id': 2, 'attr1': 'value21'}, {'id': 3, 'attr1': 'value31'}]
+        running = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_team(team_ids, return_json):
+            running.append(team_ids)
+            # Only completes if the calls of all threads are in progress at the same time.
+            while len(running) < len(test_data):
+                await asyncio.sleep(0.001)
+            return [team for team in test_data if team['id'] in team_ids]
+
+        fpl_mock.get_teams = mock_get_team
+
+        with FPLPandas(fpl=fpl_mock) as fpl, ThreadPoolExecutor(len(test_data)) as executor:
+            futures = [executor.submit(fpl.get_teams, [team['id']]) for team in test_data]
+            actual_dfs = [future.result(timeout=10) for future in futures]
+
+        for team, actual_df in zip(test_data, actual_dfs):
+            assert_frame_equal(pd.DataFrame.from_dict([team]).set_index('id'), actual_df)
+
+        with self.assertRaisesRegex(RuntimeError, 'closed'):
+            fpl.get_teams()
+
+    def test_snapshot_shared(self):
+        static = {'teams': [{'id': 1, 'attr1': 'value11'}, {'id': 2, 'attr1': 'value21'}],
+                  'events': [{'id': 1, 'is_current': True}, {'id': 2, 'is_current': False}],
+                  'elements': [{'id': 1, 'attr1': 'value11'}]}
+        urls = []
+
+        async def mock_fetch(session, url):
+            urls.append(url)
+            return static
+
+        with mock.patch('fplpandas.extensions.fetch', mock_fetch), FPLPandas() as fpl:
+            teams_df = fpl.get_teams([2])
+            game_weeks_df = fpl.get_game_weeks([1, 2])
+
+            self.assertEqual(urls, ['https://fantasy.premierleague.com/api/bootstrap-static/'])
+            assert_frame_equal(pd.DataFrame.from_records([static['teams'][1]], index=['id']), teams_df)
+            assert_frame_equal(pd.DataFrame.from_records(static['events'], index=['id']), game_weeks_df)
+
+            fpl.refresh()
+            self.assertEqual(len(urls), 2)
+
+            fpl.get_teams()
+            self.assertEqual(len(urls), 2)
+
+    def test_snapshot_expired(self):
+        static = {'teams': [{'id': 1, 'attr1': 'value11'}], 'events': [], 'elements': []}
+        urls = []
+
+        async def mock_fetch(session, url):
+            urls.append(url)
+            return static
+
+        with mock.patch('fplpandas.extensions.fetch', mock_fetch), FPLPandas(snapshot_ttl=0) as fpl:
+            fpl.get_teams()
+            fpl.get_teams()
+
+            self.assertEqual(len(urls), 2)
+
+    def test_get_player_from_snapshot(self):
+        static = {'teams': [], 'events': [], 'elements': [{'id': 1, 'attr1': 'value11'}, {'id': 2, 'attr1': 'value21'}]}
+        summary = {'history_past': [], 'history': [{'fixture': 1, 'attr1': 'value11'}], 'fixtures': []}
+
+        async def mock_fetch(session, url):
+            if url.endswith('bootstrap-static/'):
+                return static
+            self.assertTrue(url.endswith('element-summary/{}/'.format(static['elements'][-1]['id'])))
+            return summary
+
+        with mock.patch('fplpandas.extensions.fetch', mock_fetch), mock.patch('fpl.fpl.fetch', mock_fetch), FPLPandas() as fpl:
+            player_df, _, history_df, _ = fpl.get_player(2)
+
+            self.assertEqual(player_df.loc[2, 'attr1'], 'value21')
+            self.assertEqual(history_df.index.tolist(), [(2, 1)])
+            self.assertNotIn('history', static['elements'][1])
+
+            with self.assertRaisesRegex(ValueError, 'Player with ID 3 not found'):
+                fpl.get_player(3)
+
+            static = {'teams': [], 'events': [], 'elements': [{'id': 3, 'attr1': 'value31'}]}
+            fpl.refresh()
+
+            player_df, _, _, _ = fpl.get_player(3)
+            self.assertEqual(player_df.loc[3, 'attr1'], 'value31')
+
+            with self.assertRaisesRegex(ValueError, 'Player with ID 2 not found'):
+                fpl.get_player(2)
+
+
+class TestAsyncFplPandas(unittest.TestCase):
+    def test_get_teams_concurrently(self):
+        test_data = [{'id': 1, 'attr1': 'value11', 'attr2': 'value12'},
+                     {'id': 2, 'attr1': 'value21', 'attr2': 'value22'}]
+        running = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_team(team_ids, return_json):
+            running.append(team_ids)
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(running), 2)
+            return [team for team in test_data if team['id'] in team_ids]
+
+        fpl_mock.get_teams = mock_get_team
+
+        async def get_teams():
+            async with AsyncFPLPandas(fpl=fpl_mock) as fpl:
+                return await asyncio.gather(fpl.get_teams([1]), fpl.get_teams([2]))
+
+        actual_dfs = asyncio.run(get_teams())
+
+        assert_frame_equal(pd.DataFrame.from_dict(test_data[:1]).set_index('id'), actual_dfs[0])
+        assert_frame_equal(pd.DataFrame.from_dict(test_data[1:]).set_index('id'), actual_dfs[1])
+
+    def test_get_fixtures_coalesced(self):
+        test_data = [{'id': 1, 'event': 1, 'finished': False}, {'id': 2, 'event': 2, 'finished': False}]
+        requested = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_fixtures(return_json):
+            requested.append(None)
+            await asyncio.sleep(0.01)
+            return test_data
+
+        fpl_mock.get_fixtures = mock_get_fixtures
+
+        async def get_fixtures():
+            async with AsyncFPLPandas(fpl=fpl_mock) as fpl:
+                actual_dfs = await asyncio.gather(fpl.get_fixtures(), fpl.get_fixtures(), fpl.get_fixtures(['event']))
+                self.assertEqual(len(requested), 2)
+
+                await fpl.get_fixtures()
+                self.assertEqual(len(requested), 3)
+                return actual_dfs
+
+        actual_dfs = asyncio.run(get_fixtures())
+
+        assert_frame_equal(pd.DataFrame.from_dict(test_data).set_index('id'), actual_dfs[0])
+        assert_frame_equal(actual_dfs[0], actual_dfs[1])
+        self.assertIsNot(actual_dfs[0], actual_dfs[1])
+        self.assertEqual(actual_dfs[2].columns.tolist(), ['event'])
+
+        actual_dfs[0].loc[1, 'event'] = 3
+        self.assertEqual(actual_dfs[1].loc[1, 'event'], 1)
+
+    def test_get_user_team(self):
+        test_data = {'picks': [{'element': 1, 'attr1': 'value11'}], 'chips': [], 'transfers': {'attr1': 'value11'}}
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_login(email, password):
+            self.assertEqual(email, 'email')
+            self.assertEqual(password, 'password')
+
+        async def mock_get_user_info():
+            return {'player': {'entry': '123'}}
+
+        async def mock_get_user_team(user_id):
+            self.assertEqual(user_id, '123')
+            return test_data
+
+        fpl_mock.get_user_team = mock_get_user_team
+        fpl_mock.get_user_info = mock_get_user_info
+        fpl_mock.login = mock_login
+
+        async def get_user_team():
+            async with AsyncFPLPandas('email', 'password', fpl=fpl_mock) as fpl:
+                return await fpl.get_user_team()
+
+        actual_picks_df, _, _ = asyncio.run(get_user_team())
+
+        assert_frame_equal(pd.DataFrame.from_dict(test_data['picks']).set_index('element').rename(index={'element': 'player_id'}),
+                           actual_picks_df)
+
+    def test_iter_players_stop_early(self):
+        started = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            return [{'id': player_id} for player_id in range(1, 101)]
+
+        async def mock_get_player(player_id, players, include_summary, return_json):
+            started.append(player_id)
+            await asyncio.sleep(0.001)
+            return {'id': player_id, 'history_past': [], 'history': [], 'fixtures': []}
+
+        fpl_mock.get_players = mock_get_players
+        fpl_mock.get_player = mock_get_player
+
+        async def get_first_batch():
+            async with AsyncFPLPandas(fpl=fpl_mock) as fpl:
+                batches = fpl.iter_players(batch_size=10)
+                async for players_df, _, _, _ in batches:
+                    await batches.aclose()
+                    return players_df
+
+        players_df = asyncio.run(get_first_batch())
+
+        self.assertEqual(players_df.shape[0], 10)
+        self.assertLessEqual(len(started), 30)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import asyncio
+import json
+import time
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fpl.utils import fetch
+from fplpandas.http import RateLimiter, Session, _parse_retry_after
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_rate(self):
+        limiter = RateLimiter(rate=100, max_rate=100, burst=1)
+
+        async def acquire_all():
+            start = time.monotonic()
+            for _ in range(11):
+                await limiter.acquire()
+                limiter.release()
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(acquire_all()), 0.09)
+
+    def test_max_concurrency(self):
+        limiter = RateLimiter(rate=1000, burst=1000, max_concurrency=2)
+        running = []
+        max_running = []
+
+        async def request():
+            await limiter.acquire()
+            running.append(1)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            limiter.release()
+
+        async def request_all():
+            await asyncio.gather(*[request() for _ in range(10)])
+
+        asyncio.run(request_all())
+        self.assertEqual(max(max_running), 2)
+
+    def test_throttled_and_succeeded(self):
+        limiter = RateLimiter(rate=20, max_rate=30, min_rate=4, increase=5)
+
+        limiter.throttled(0)
+        self.assertEqual(limiter.rate, 10)
+        limiter.throttled(0)
+        limiter.throttled(0)
+        self.assertEqual(limiter.rate, 4)
+
+        limiter.succeeded()
+        self.assertEqual(limiter.rate, 9)
+        for _ in range(10):
+            limiter.succeeded()
+        self.assertEqual(limiter.rate, 30)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(_parse_retry_after('2'), 2.0)
+        self.assertEqual(_parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(_parse_retry_after('soon'))
+        self.assertIsNone(_parse_retry_after(None))
+
+
+class TestSession(unittest.TestCase):
+    def test_fetch_retries_after_429(self):
+        requests = []
+
+        async def handle(request):
+            requests.append(request.path)
+            if len(requests) == 1:
+                return web.Response(status=429, headers={'Retry-After': '0'})
+            return web.json_response({'id': 1})
+
+        async def fetch_once():
+            app = web.Application()
+            app.router.add_get('/api/test/', handle)
+            limiter = RateLimiter(rate=20)
+
+            async with TestServer(app) as server, aiohttp.ClientSession() as client_session:
+                session = Session(client_session, limiter)
+                result = await fetch(session, str(server.make_url('/api/test/')))
+
+            return result, limiter.rate
+
+        result, rate = asyncio.run(fetch_once())
+        self.assertEqual(result, {'id': 1})
+        self.assertEqual(requests, ['/api/test/', '/api/test/'])
+        self.assertEqual(rate, 10.5)
+
+
+    def test_fetch_with_json_loads(self):
+        bodies = []
+
+        def json_loads(body):
+            bodies.append(body)
+            return json.loads(body)
+
+        async def handle_json(request):
+            return web.json_response({'id': 1})
+
+        async def handle_text(request):
+            return web.Response(text='{}', content_type='text/html')
+
+        async def fetch_json():
+            app = web.Application()
+            app.router.add_get('/api/test/', handle_json)
+            app.router.add_get('/api/text/', handle_text)
+
+            async with TestServer(app) as server, aiohttp.ClientSession() as client_session:
+                session = Session(client_session, json_loads=json_loads)
+                async with session.get(str(server.make_url('/api/text/'))) as response:
+                    with self.assertRaises(aiohttp.ContentTypeError):
+                        await response.json()
+                return await fetch(session, str(server.make_url('/api/test/')))
+
+        self.assertEqual(asyncio.run(fetch_json()), {'id': 1})
+        self.assertEqual(bodies, [b'{"id": 1}'])
+
+if __name__ == '__main__':
+    unittest.main()
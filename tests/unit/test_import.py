@@ -0,0 +1,35 @@
+import unittest
+import subprocess
+import sys
+import fplpandas
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+def get_imported(statement: str, modules: list) -> list:
+    code = f'import sys\n{statement}\nprint(" ".join(m for m in {modules!r} if m in sys.modules))'
+    return subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout.split()
+
+
+class TestImport(unittest.TestCase):
+    def test_import_lazy(self):
+        self.assertEqual(get_imported('import fplpandas', ['pandas', 'aiohttp', 'fpl']), [])
+        self.assertEqual(get_imported('from fplpandas import load_snapshot, FPLPandas\nFPLPandas().close()',
+                                      ['aiohttp', 'fpl']), [])
+        self.assertEqual(get_imported('from fplpandas.extensions import _create_fpl', ['aiohttp', 'fpl']), ['aiohttp', 'fpl'])
+
+    def test_exports(self):
+        from fplpandas.client import FPLPandas
+
+        self.assertIs(fplpandas.FPLPandas, FPLPandas)
+        self.assertIn('HistoryWarehouse', dir(fplpandas))
+        for name in ['PlayerFeatures', 'MetricsCollector']:
+            self.assertIn(name, fplpandas.__all__)
+            self.assertIsNotNone(getattr(fplpandas, name))
+        with self.assertRaisesRegex(AttributeError, 'no attribute'):
+            fplpandas.Unknown
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import unittest.mock as mock
+from fplpandas import FPLPandas
+from fplpandas.live import LiveState
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+def create_elements(stats: dict) -> list:
+    return [{'id': player_id, 'stats': player_stats, 'explain': []} for player_id, player_stats in stats.items()]
+
+
+class TestLiveState(unittest.TestCase):
+    def test_update(self):
+        state = LiveState(['minutes', 'total_points'])
+
+        delta_df = state.update(create_elements({1: {'minutes': 0, 'total_points': 0},
+                                                 2: {'minutes': 0, 'total_points': 0}}))
+        self.assertEqual(delta_df.index.tolist(), [1, 2])
+        state_df = state.df
+
+        delta_df = state.update(create_elements({1: {'minutes': 10, 'total_points': 1},
+                                                 2: {'minutes': 0, 'total_points': 0}}))
+        self.assertEqual(delta_df.index.tolist(), [1])
+        self.assertEqual(delta_df.loc[1, 'minutes'], 10)
+        self.assertIs(state.df, state_df)
+        self.assertEqual(state_df.loc[1, 'total_points'], 1)
+
+        delta_df = state.update(create_elements({1: {'minutes': 10, 'total_points': 1},
+                                                 2: {'minutes': 0, 'total_points': 0}}))
+        self.assertEqual(len(delta_df), 0)
+
+        delta_df = state.update(create_elements({2: {'minutes': 0}, 3: {'minutes': 5, 'total_points': 1}}))
+        self.assertEqual(delta_df.index.tolist(), [2, 3])
+        self.assertEqual(state.df.index.tolist(), [1, 2, 3])
+        self.assertEqual(state.df['total_points'].isna().tolist(), [False, True, False])
+
+    def test_fpl_pandas_poll_live(self):
+        responses = [{1: {'total_points': 0}, 2: {'total_points': 0}},
+                     {1: {'total_points': 0}, 2: {'total_points': 0}},
+                     {1: {'total_points': 2}, 2: {'total_points': 0}}]
+        requested = []
+
+        refreshes = []
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_gameweek_live(gameweek_id):
+            requested.append(gameweek_id)
+            return {'elements': create_elements(responses[len(requested) - 1])}
+
+        async def mock_refresh():
+            refreshes.append(True)
+
+        fpl_mock.get_gameweek_live = mock_get_gameweek_live
+        fpl_mock.refresh = mock_refresh
+        state = LiveState(['total_points'])
+
+        with FPLPandas(fpl=fpl_mock, snapshot_ttl=0) as fpl:
+            deltas = list(fpl.poll_live(5, interval=0.001, state=state, max_polls=3))
+
+        self.assertEqual(requested, [5, 5, 5])
+        self.assertEqual(len(refreshes), 1)
+        self.assertEqual([delta_df.index.tolist() for delta_df in deltas], [[1, 2], [1]])
+        self.assertEqual(state.df['total_points'].tolist(), [2, 0])
+
+    def test_fpl_pandas_poll_live_current_game_week(self):
+        requested = []
+
+        fpl_mock = mock.MagicMock()
+        fpl_mock.current_gameweek = 7
+
+        async def mock_get_gameweek_live(gameweek_id):
+            requested.append(gameweek_id)
+            return {'elements': create_elements({1: {'total_points': 3}})}
+
+        fpl_mock.get_gameweek_live = mock_get_gameweek_live
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            deltas = list(fpl.poll_live(max_polls=1))
+
+        self.assertEqual(requested, [7])
+        self.assertEqual(deltas[0].loc[1, 'total_points'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import asyncio
+import json
+import tempfile
+from fpl.constants import API_URLS
+from fplpandas import AsyncFPLPandas
+from fplpandas.http import RateLimiter
+from fplpandas.metrics import MetricsCollector, get_endpoint
+from fplpandas.replay import ResponseRecorder, ReplayServer
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+class TestMetrics(unittest.TestCase):
+    def test_get_endpoint(self):
+        self.assertEqual(get_endpoint(API_URLS['player'].format(12)), 'player')
+        self.assertEqual(get_endpoint(API_URLS['gameweek_fixtures'].format(3)), 'gameweek_fixtures')
+        self.assertEqual(get_endpoint('http://127.0.0.1:8080/api/fixtures/'), 'fixtures')
+        self.assertEqual(get_endpoint('https://example.com/'), 'other')
+
+    def test_collector(self):
+        collector = MetricsCollector()
+        collector.on_request('player', 200, 1000, 0.1)
+        collector.on_request('player', 200, 500, 0.3)
+        collector.on_request('static', 304, 0, 0.05)
+        collector.on_conversion('get_players', 0.5)
+        collector.on_login(1.5)
+
+        self.assertEqual(collector.get_counter('requests_total'), 3)
+        self.assertEqual(collector.get_counter('requests_total', status=200), 2)
+        self.assertEqual(collector.get_counter('received_bytes_total', endpoint='player'), 1500)
+        self.assertEqual(collector.get_summary('request_duration_seconds', endpoint='player'), (2, 0.4))
+        self.assertEqual(collector.get_summary('conversion_duration_seconds', method='get_players'), (1, 0.5))
+
+        text = collector.to_prometheus()
+        self.assertIn('# TYPE fplpandas_requests_total counter', text)
+        self.assertIn('fplpandas_requests_total{endpoint="player",status="200"} 2.0', text)
+        self.assertIn('fplpandas_login_duration_seconds_sum 1.5', text)
+        self.assertIn('fplpandas_login_duration_seconds_count 1', text)
+
+        collector.reset()
+        self.assertEqual(collector.get_counter('requests_total'), 0)
+
+    def test_fpl_pandas_instrumentation(self):
+        with tempfile.TemporaryDirectory() as path:
+            recorder = ResponseRecorder(path)
+            recorder.record(API_URLS['static'], json.dumps({'elements': [{'id': 1}], 'teams': [{'id': 1}],
+                                                            'events': [{'id': 1, 'is_current': True}]}).encode())
+            recorder.record(API_URLS['player'].format(1), json.dumps({'history_past': [], 'history': [],
+                                                                      'fixtures': []}).encode())
+            recorder.record(API_URLS['me'], json.dumps({'player': {'entry': 123}}).encode())
+            collector = MetricsCollector()
+
+            async def get_players():
+                rate_limiter = RateLimiter(rate=1000.0, max_rate=1000.0, burst=100)
+                async with ReplayServer(path, throttle_rate=0.5, retry_after=0.001, seed=4) as server, \
+                        AsyncFPLPandas('email', 'password', base_url=server.base_url, rate_limiter=rate_limiter,
+                                       instrumentation=collector) as fpl:
+                    await fpl.get_players()
+                    await fpl.get_teams()
+                    await fpl.get_user_info()
+                    return server.throttled
+
+            throttled = asyncio.run(get_players())
+
+        self.assertEqual(collector.get_counter('requests_total', endpoint='static', status=200), 1)
+        self.assertEqual(collector.get_counter('requests_total', endpoint='player', status=200), 1)
+        self.assertEqual(collector.get_counter('retries_total', reason='throttled'), throttled)
+        self.assertGreater(collector.get_counter('received_bytes_total', endpoint='static'), 0)
+        self.assertEqual(collector.get_summary('decode_duration_seconds')[0], 3)
+        self.assertEqual(collector.get_summary('login_duration_seconds')[0], 1)
+        self.assertEqual(collector.get_summary('wait_duration_seconds', reason='rate_limit')[0], 3 + throttled)
+        self.assertEqual(collector.get_summary('conversion_duration_seconds', method='get_players')[0], 1)
+        self.assertEqual(collector.get_summary('conversion_duration_seconds', method='get_teams')[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
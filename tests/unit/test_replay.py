@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+from fpl.constants import API_URLS
+from fplpandas import AsyncFPLPandas
+from fplpandas.http import RateLimiter
+from fplpandas.replay import ResponseRecorder, ReplayServer, get_file_name, rewrite_url
+import logging as log
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.recordings = os.path.join(self.temp_dir.name, 'recordings')
+
+        static = {'elements': [{'id': 1, 'web_name': 'Test', 'total_points': 10}],
+                  'teams': [{'id': 1, 'name': 'Arsenal'}, {'id': 2, 'name': 'Aston Villa'}],
+                  'events': [{'id': 1, 'is_current': True}]}
+        summary = {'history_past': [{'season_name': '2019/20', 'total_points': 100}],
+                   'history': [{'fixture': 1, 'total_points': 10}],
+                   'fixtures': [{'event': 2, 'kickoff_time': '2099-08-01T14:00:00Z'}]}
+
+        recorder = ResponseRecorder(self.recordings)
+        recorder.record(API_URLS['static'], json.dumps(static).encode())
+        recorder.record(API_URLS['player'].format(1), json.dumps(summary).encode())
+        recorder.record(API_URLS['me'], json.dumps({'player': {'entry': 123}}).encode())
+        recorder.record(API_URLS['user_team'].format(123),
+                        json.dumps({'picks': [{'element': 1, 'position': 1}], 'chips': [], 'transfers': {}}).encode())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rewrite_url(self):
+        self.assertEqual(rewrite_url(API_URLS['gameweek_fixtures'].format(1), 'http://127.0.0.1:8080'),
+                         'http://127.0.0.1:8080/api/fixtures/?event=1')
+        self.assertEqual(rewrite_url('https://users.premierleague.com/accounts/login/', 'http://127.0.0.1:8080'),
+                         'http://127.0.0.1:8080/users/accounts/login/')
+        self.assertEqual(rewrite_url('https://example.com/', 'http://127.0.0.1:8080'), 'https://example.com/')
+        self.assertEqual(get_file_name('/api/fixtures/?event=1'), 'api%2Ffixtures%2F%3Fevent%3D1.json')
+
+    def test_record_and_replay(self):
+        recorded = os.path.join(self.temp_dir.name, 'recorded')
+
+        async def replay():
+            async with ReplayServer(self.recordings) as server, \
+                    AsyncFPLPandas('email', 'password', base_url=server.base_url,
+                                   recorder=ResponseRecorder(recorded)) as fpl:
+                teams_df = await fpl.get_teams()
+                players_df, _, history_df, _ = await fpl.get_players([1])
+                picks_df, _, _ = await fpl.get_user_team()
+                with self.assertRaises(Exception):
+                    await fpl.get_player(2)
+                return teams_df, players_df, history_df, picks_df
+
+        teams_df, players_df, history_df, picks_df = asyncio.run(replay())
+
+        self.assertEqual(teams_df['name'].tolist(), ['Arsenal', 'Aston Villa'])
+        self.assertEqual(players_df.index.tolist(), [1])
+        self.assertEqual(history_df['total_points'].tolist(), [10])
+        self.assertEqual(picks_df.index.tolist(), [1])
+        self.assertEqual(sorted(os.listdir(recorded)), sorted(os.listdir(self.recordings)))
+
+    def test_latency_and_throttling(self):
+        async def replay():
+            rate_limiter = RateLimiter(rate=1000.0, max_rate=1000.0, burst=100)
+            async with ReplayServer(self.recordings, latency=0.001, throttle_rate=0.5, retry_after=0.001,
+                                    seed=4) as server, \
+                    AsyncFPLPandas(base_url=server.base_url, rate_limiter=rate_limiter) as fpl:
+                frames = await asyncio.gather(*[fpl.get_teams() for _ in range(10)])
+                return frames, server.requests, server.throttled
+
+        frames, requests, throttled = asyncio.run(replay())
+
+        self.assertTrue(all(df['name'].tolist() == ['Arsenal', 'Aston Villa'] for df in frames))
+        self.assertGreater(throttled, 0)
+        self.assertEqual(requests - throttled, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import unittest.mock as mock
+from fplpandas import FPLPandas
+from fplpandas.schema import SCHEMAS, apply_schema
+import logging as log
+import pandas as pd
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+class TestSchema(unittest.TestCase):
+    def test_apply_schema(self):
+        df = pd.DataFrame.from_records([{'id': 1, 'status': 'a', 'form': '2.5', 'now_cost': 45, 'news_added': None,
+                                         'chance_of_playing_next_round': None, 'transfers_in': 1000000,
+                                         'in_dreamteam': False, 'web_name': 'Test'},
+                                        {'id': 2, 'status': 'i', 'form': '0.0', 'now_cost': 130,
+                                         'news_added': '2020-09-20T10:30:17.284405Z',
+                                         'chance_of_playing_next_round': 75, 'transfers_in': 20,
+                                         'in_dreamteam': True, 'web_name': 'Test2'}], index=['id'])
+
+        actual_df = apply_schema(df, SCHEMAS['players'])
+
+        self.assertEqual(actual_df['status'].dtype, 'category')
+        self.assertEqual(actual_df['form'].dtype, 'float32')
+        self.assertEqual(actual_df['form'].tolist(), [2.5, 0.0])
+        self.assertEqual(actual_df['now_cost'].dtype, SCHEMAS['players']['now_cost'])
+        self.assertTrue(pd.isna(actual_df['chance_of_playing_next_round'].iloc[0]))
+        self.assertEqual(actual_df['transfers_in'].tolist(), [1000000, 20])
+        self.assertEqual(actual_df['in_dreamteam'].dtype, 'boolean')
+        self.assertEqual(str(actual_df['news_added'].dtype), 'datetime64[ns, UTC]')
+        self.assertEqual(actual_df['web_name'].dtype, 'object')
+        self.assertEqual(df['form'].dtype, 'object')
+
+    def test_apply_schema_non_integers(self):
+        df = pd.DataFrame({'minutes': [1.5, None], 'bonus': ['x', 1]})
+
+        actual_df = apply_schema(df, {'minutes': 'Int16', 'bonus': 'Int16'})
+
+        self.assertEqual(actual_df['minutes'].dtype, 'float32')
+        self.assertEqual(actual_df['bonus'].dtype, 'Int16')
+        self.assertTrue(pd.isna(actual_df['bonus'].iloc[0]))
+
+    def test_apply_schema_fixed_widths(self):
+        columns = ['transfers_in', 'now_cost', 'chance_of_playing_next_round']
+        empty_df = pd.DataFrame(columns=columns)
+        small_df = pd.DataFrame({'transfers_in': [0, 1], 'now_cost': [45, None],
+                                 'chance_of_playing_next_round': [0, 25]})
+        large_df = pd.DataFrame({'transfers_in': [0, 5000000], 'now_cost': [45, 150],
+                                 'chance_of_playing_next_round': [None, 100]})
+
+        actual_dfs = [apply_schema(df, SCHEMAS['players']) for df in [empty_df, small_df, large_df]]
+
+        for column in columns:
+            self.assertEqual({str(df[column].dtype) for df in actual_dfs}, {SCHEMAS['players'][column]})
+        self.assertEqual(pd.concat(actual_dfs)['transfers_in'].dtype, 'Int32')
+
+        with self.assertRaisesRegex(ValueError, 'now_cost'):
+            apply_schema(pd.DataFrame({'now_cost': [100000]}), SCHEMAS['players'])
+
+    def test_compact_memory(self):
+        records = [{'player_id': player_id, 'fixture': fixture, 'kickoff_time': '2020-09-12T11:30:00Z',
+                    'was_home': fixture % 2 == 0, 'total_points': fixture % 10, 'minutes': 90,
+                    'influence': '12.4', 'ict_index': '3.2', 'selected': 100000 + player_id}
+                   for player_id in range(600) for fixture in range(30)]
+        df = pd.DataFrame.from_records(records).set_index(['player_id', 'fixture'])
+
+        actual_df = apply_schema(df, SCHEMAS['players_history'])
+
+        self.assertLess(actual_df.memory_usage(deep=True).sum() * 4, df.memory_usage(deep=True).sum())
+
+    def test_fpl_pandas_compact(self):
+        test_data = [{'id': 1, 'name': 'Arsenal', 'strength': 4, 'form': None},
+                     {'id': 2, 'name': 'Aston Villa', 'strength': 3, 'form': '1.2'}]
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_teams(team_ids, return_json):
+            return test_data
+
+        fpl_mock.get_teams = mock_get_teams
+
+        with FPLPandas(fpl=fpl_mock, compact=True) as fpl:
+            actual_df = fpl.get_teams()
+
+        self.assertEqual(actual_df['name'].dtype, 'category')
+        self.assertEqual(actual_df['strength'].dtype, SCHEMAS['teams']['strength'])
+        self.assertEqual(actual_df['form'].dtype, 'float32')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import unittest.mock as mock
+import tempfile
+import time
+from fplpandas import FPLPandas, load_snapshot, list_snapshots
+from fplpandas.snapshot import save_snapshot, get_manifest
+import logging as log
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_load(self):
+        teams_df = pd.DataFrame.from_records([{'id': 1, 'name': 'Arsenal', 'strength': 4},
+                                              {'id': 2, 'name': 'Aston Villa', 'strength': 3}], index=['id'])
+        history_df = pd.DataFrame.from_records([{'player_id': 1, 'fixture': 1, 'total_points': 2, 'was_home': True},
+                                                {'player_id': 1, 'fixture': 2, 'total_points': 6, 'was_home': False}]) \
+            .set_index(['player_id', 'fixture'])
+
+        for file_format in ['arrow', 'parquet']:
+            path = f'{self.temp_dir.name}/{file_format}'
+            version = save_snapshot({'teams': teams_df, 'players_history': history_df}, path, file_format)
+
+            for memory_map in [True, False]:
+                frames = load_snapshot(path, memory_map=memory_map)
+                assert_frame_equal(teams_df, frames['teams'])
+                assert_frame_equal(history_df, frames['players_history'])
+
+            frames = load_snapshot(path, version, names=['teams'])
+            self.assertEqual(list(frames), ['teams'])
+            self.assertEqual(get_manifest(path)['file_format'], file_format)
+
+    def test_versions(self):
+        first_df = pd.DataFrame.from_records([{'id': 1, 'value': 1}], index=['id'])
+        second_df = pd.DataFrame.from_records([{'id': 1, 'value': 2}], index=['id'])
+
+        first_version = save_snapshot({'teams': first_df}, self.temp_dir.name)
+        time.sleep(0.001)
+        second_version = save_snapshot({'teams': second_df}, self.temp_dir.name)
+
+        self.assertEqual(list_snapshots(self.temp_dir.name), [first_version, second_version])
+        assert_frame_equal(second_df, load_snapshot(self.temp_dir.name)['teams'])
+        assert_frame_equal(first_df, load_snapshot(self.temp_dir.name, first_version)['teams'])
+
+    def test_load_missing(self):
+        with self.assertRaisesRegex(ValueError, 'No snapshot found'):
+            load_snapshot(self.temp_dir.name)
+
+        save_snapshot({'teams': pd.DataFrame({'value': [1]})}, self.temp_dir.name)
+        with self.assertRaisesRegex(ValueError, 'players not found'):
+            load_snapshot(self.temp_dir.name, names=['players'])
+
+    def test_fpl_pandas_save_snapshot(self):
+        test_data = [{'id': 1, 'attr1': 'value11', 'attr2': 'value12'}]
+        players_data = [{'id': 1, 'attr1': 'value11',
+                         'history_past': [{'season_name': '2017/18', 'total_points': 100}],
+                         'history': [{'fixture': 1, 'total_points': 2}],
+                         'fixtures': []}]
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_teams(team_ids, return_json):
+            return test_data
+
+        async def mock_get_game_weeks(game_week_ids, return_json):
+            return test_data
+
+        async def mock_get_fixtures(return_json):
+            return test_data
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            return players_data
+
+        fpl_mock.get_teams = mock_get_teams
+        fpl_mock.get_gameweeks = mock_get_game_weeks
+        fpl_mock.get_fixtures = mock_get_fixtures
+        fpl_mock.get_players = mock_get_players
+
+        with FPLPandas(fpl=fpl_mock) as fpl:
+            fpl.save_snapshot(self.temp_dir.name)
+            players_df, _, history_df, _ = fpl.get_players()
+            teams_df = fpl.get_teams()
+
+        frames = load_snapshot(self.temp_dir.name)
+
+        self.assertEqual(set(frames), {'teams', 'game_weeks', 'fixtures', 'players', 'players_history_past',
+                                       'players_history', 'players_fixtures'})
+        assert_frame_equal(teams_df, frames['teams'])
+        assert_frame_equal(players_df, frames['players'])
+        assert_frame_equal(history_df, frames['players_history'])
+        self.assertEqual(frames['players_fixtures'].index.names, ['player_id', 'event'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import unittest.mock as mock
+import tempfile
+from fplpandas import FPLPandas
+from fplpandas.warehouse import HistoryWarehouse
+import logging as log
+import pandas as pd
+
+log.basicConfig(level=log.INFO, format='%(message)s')
+
+
+def create_history_df(records: list) -> pd.DataFrame:
+    return pd.DataFrame.from_records(records).set_index(['player_id', 'fixture'])
+
+
+class TestHistoryWarehouse(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.players_df = pd.DataFrame.from_records([{'player_id': 1, 'team': 1, 'code': 101},
+                                                     {'player_id': 2, 'team': 2, 'code': 102}], index=['player_id'])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_append_and_query(self):
+        warehouse = HistoryWarehouse(self.temp_dir.name)
+        history_df = create_history_df([
+            {'player_id': 1, 'fixture': 1, 'round': 1, 'kickoff_time': '2019-08-10T14:00:00Z', 'total_points': 2},
+            {'player_id': 2, 'fixture': 1, 'round': 1, 'kickoff_time': '2019-08-10T14:00:00Z', 'total_points': 6},
+            {'player_id': 1, 'fixture': 12, 'round': 2, 'kickoff_time': '2019-08-17T14:00:00Z', 'total_points': 1}])
+
+        self.assertEqual(warehouse.append(history_df, self.players_df), 3)
+        self.assertEqual(warehouse.append(history_df, self.players_df), 0)
+
+        warehouse = HistoryWarehouse(self.temp_dir.name)
+        self.assertEqual(warehouse.list_seasons(), ['2019/20'])
+        self.assertEqual(warehouse.list_events('2019/20'), [1, 2])
+
+        all_df = warehouse.query()
+        self.assertEqual(all_df.index.names, ['season', 'player_id', 'fixture'])
+        self.assertEqual(all_df.index.tolist(), [('2019/20', 1, 1), ('2019/20', 1, 12), ('2019/20', 2, 1)])
+        self.assertEqual(all_df['element_code'].tolist(), [101, 101, 102])
+
+        self.assertEqual(warehouse.query(player_ids=[2])['total_points'].tolist(), [6])
+        self.assertEqual(warehouse.query(team_ids=[1]).index.tolist(), [('2019/20', 1, 1), ('2019/20', 1, 12)])
+        self.assertEqual(warehouse.query(events=(2, 38), columns=['total_points']).columns.tolist(), ['total_points'])
+        self.assertEqual(len(warehouse.query(events=(2, 38))), 1)
+        self.assertEqual(len(warehouse.query(seasons=['2020/21'])), 0)
+
+    def test_append_changed_and_moved(self):
+        warehouse = HistoryWarehouse(self.temp_dir.name)
+        warehouse.append(create_history_df([
+            {'player_id': 1, 'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 2},
+            {'player_id': 1, 'fixture': 2, 'round': 2, 'kickoff_time': '2020-09-19T14:00:00Z', 'total_points': 3}]))
+
+        stored = warehouse.append(create_history_df([
+            {'player_id': 1, 'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 5},
+            {'player_id': 1, 'fixture': 2, 'round': 3, 'kickoff_time': '2020-09-26T14:00:00Z', 'total_points': 3},
+            {'player_id': 1, 'fixture': 100, 'round': 1, 'kickoff_time': '2021-09-11T14:00:00Z', 'total_points': 1}]))
+
+        self.assertEqual(stored, 3)
+        self.assertEqual(warehouse.list_seasons(), ['2020/21', '2021/22'])
+        self.assertEqual(warehouse.query(seasons=['2020/21'])['total_points'].tolist(), [5, 3])
+        self.assertEqual(len(warehouse.query(seasons=['2020/21'], events=(2, 2))), 0)
+        self.assertEqual(warehouse.query(seasons=['2020/21'], events=(3, 3))['round'].tolist(), [3])
+
+    def test_compact(self):
+        warehouse = HistoryWarehouse(self.temp_dir.name)
+        warehouse.append(create_history_df([
+            {'player_id': 1, 'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 2},
+            {'player_id': 1, 'fixture': 2, 'round': 2, 'kickoff_time': '2020-09-19T14:00:00Z', 'total_points': 3}]))
+        warehouse.append(create_history_df([
+            {'player_id': 1, 'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 5},
+            {'player_id': 1, 'fixture': 2, 'round': 3, 'kickoff_time': '2020-09-26T14:00:00Z', 'total_points': 3}]))
+        expected_df = warehouse.query()
+
+        self.assertEqual(warehouse.compact(), 5)
+        self.assertEqual(warehouse.compact(), 0)
+        self.assertEqual(warehouse.list_events('2020/21'), [1, 3])
+        pd.testing.assert_frame_equal(warehouse.query(), expected_df)
+
+        self.assertEqual(warehouse.append(create_history_df([
+            {'player_id': 1, 'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 5}])), 0)
+
+    def test_append_missing_columns(self):
+        with self.assertRaisesRegex(ValueError, 'kickoff_time'):
+            HistoryWarehouse(self.temp_dir.name).append(create_history_df([{'player_id': 1, 'fixture': 1, 'round': 1}]))
+
+    def test_fpl_pandas_warehouse(self):
+        test_data = [{'id': 1, 'team': 1, 'code': 101, 'history_past': [],
+                      'history': [{'fixture': 1, 'round': 1, 'kickoff_time': '2020-09-12T14:00:00Z', 'total_points': 2}],
+                      'fixtures': []}]
+
+        fpl_mock = mock.MagicMock()
+
+        async def mock_get_players(player_ids, include_summary, return_json):
+            return test_data
+
+        fpl_mock.get_players = mock_get_players
+        warehouse = HistoryWarehouse(self.temp_dir.name)
+
+        with FPLPandas(fpl=fpl_mock, warehouse=warehouse) as fpl:
+            fpl.get_players()
+            fpl.get_players(columns={'players_history': ['total_points']})
+
+        actual_df = warehouse.query()
+        self.assertEqual(actual_df.index.tolist(), [('2020/21', 1, 1)])
+        self.assertEqual(actual_df['team'].tolist(), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()